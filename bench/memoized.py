@@ -0,0 +1,61 @@
+"""Micro-benchmark for the overhead of memoized calls that hit the cache.
+
+Compares a plain dict lookup with cache hits through `memoized` for each of
+its key strategies, and with hits on the library's hottest memoized
+functions. Run it with ``python bench/memoized.py [number]``.
+"""
+import sys
+import timeit
+
+import sportsref
+from sportsref import decorators
+
+URL = '/players/B/BradTo00.htm'
+LOC = 'NWE 35'
+
+def single(x):
+    return x
+
+def several(x, y, z):
+    return x
+
+def listArg(xs):
+    return xs[0]
+
+def nsPerCall(stmt, setup, number):
+    times = timeit.repeat(stmt, setup, repeat=3, number=number)
+    return min(times) / number * 1e9
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    number = int(argv[0]) if argv else 200000
+    setup = ('import sportsref; from __main__ import URL, LOC, table, '
+             'memoSingle, memoSeveral, memoList')
+
+    global memoSingle, memoSeveral, memoList, table
+    memoSingle = decorators.memoized(single)
+    memoSeveral = decorators.memoized(several)
+    memoList = decorators.memoized(listArg)
+    table = {URL: 'BradTo00'}
+    # warm the caches so that every timed call is a hit
+    memoSingle(URL)
+    memoSeveral(URL, 2013, None)
+    memoList([URL, 2013])
+    sportsref.utils.relURLToID(URL)
+    sportsref.nfl.pbp.locToFeatures(LOC)
+
+    cases = [
+        ('dict lookup', 'table[URL]'),
+        ('memoized, one scalar arg', 'memoSingle(URL)'),
+        ('memoized, several scalar args', 'memoSeveral(URL, 2013, None)'),
+        ('memoized, general key (list arg)', 'memoList([URL, 2013])'),
+        ('utils.relURLToID', 'sportsref.utils.relURLToID(URL)'),
+        ('nfl.pbp.locToFeatures', 'sportsref.nfl.pbp.locToFeatures(LOC)'),
+    ]
+    print '{:<36}{:>12}'.format('case', 'ns/call')
+    for name, stmt in cases:
+        print '{:<36}{:>12.0f}'.format(name, nsPerCall(stmt, setup, number))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
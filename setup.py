@@ -10,6 +10,7 @@ setup(name='sportsref',
       packages=find_packages(),
       install_requires=[
           'appdirs',
+          'lxml',
           'numexpr',
           'numpy',
           'pandas',
@@ -1,3 +1,5 @@
+__version__ = '0.6.1'
+
 SITE_ABBREV = {
     'http://www.pro-football-reference.com': 'pfr',
     'http://www.basketball-reference.com': 'bkref',
@@ -6,7 +8,10 @@ SITE_ABBREV = {
 }
 
 import decorators
+from decorators import session
+import cache
 import utils
+import ids
 import nfl
 import nba
 import ncaaf
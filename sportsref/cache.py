@@ -0,0 +1,706 @@
+"""Statistics and inspection for sportsref's caches.
+
+Two caches are covered: the on-disk HTML cache maintained by
+`sportsref.decorators.cacheHTML` and the in-process caches kept by
+`sportsref.decorators.memoized` (which hold parsed docs and tables).
+
+Counters are kept per process; the disk inventory can also be inspected from
+the command line with ``python -m sportsref.cache``.
+
+A shared remote cache can be layered behind the local disk cache by pointing
+`setRemote` (or the SPORTSREF_REMOTE_CACHE environment variable) at an HTTP
+key-value service that supports GET, PUT, and HEAD on ``<url>/<key>``, such as
+the reference server in `sportsref.cacheserver`.
+
+Negative results (pages that don't exist, empty responses, and empty tables)
+are cached separately under ``CACHE_DIR/negative`` for NEGATIVE_TTL seconds,
+so repeated probing for missing data doesn't refetch or reparse anything.
+
+In stale-while-revalidate mode (SPORTSREF_SWR_MAX_STALENESS or
+`setStaleWhileRevalidate`), expired pages up to a maximum staleness are
+served immediately while they are refreshed on background threads.
+
+With HTML slimming on (SPORTSREF_SLIM_HTML or `setSlimHTML`), pages are
+reduced to the markup the parsers read before they are cached; see
+`slimHTML`.
+
+With result persistence on (SPORTSREF_PERSIST_RESULTS or
+`setPersistResults`), results of expensive methods decorated with
+`sportsref.decorators.persistent` (such as the NFL `BoxScore.pbp`) are kept
+under ``CACHE_DIR/results``, as Parquet files when pyarrow or fastparquet is
+installed and as pickles otherwise.
+"""
+import argparse
+import collections
+import cPickle as pickle
+import email.utils
+import hashlib
+import httplib
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib
+import urllib2
+
+import appdirs
+import lxml.html
+import pandas as pd
+
+import sportsref
+
+CACHE_DIR = appdirs.user_cache_dir('sportsref', 'mgoldberg')
+
+# (label, upper bound in seconds) for the buckets of the age histograms
+AGE_BUCKETS = [
+    ('<1h', 60*60),
+    ('<1d', 24*60*60),
+    ('<1w', 7*24*60*60),
+    ('<30d', 30*24*60*60),
+    ('<1y', 365*24*60*60),
+    ('>=1y', None),
+]
+
+# names of the events counted by cacheHTML
+EVENTS = [
+    'hits', 'misses', 'staleRefetches', 'bytesRead', 'bytesWritten',
+    'uncacheable', 'remoteHits', 'remoteMisses', 'remotePuts',
+    'remoteErrors', 'negativeHits', 'negativeStores', 'staleServed',
+    'backgroundRefreshes', 'refreshErrors', 'slimmed', 'slimRebuilds',
+    'resultHits', 'resultStores',
+]
+
+# base URL of the shared remote cache (None disables it) and request timeout
+REMOTE_URL = os.environ.get('SPORTSREF_REMOTE_CACHE') or None
+REMOTE_TIMEOUT = float(os.environ.get('SPORTSREF_REMOTE_CACHE_TIMEOUT', 2.))
+
+# directory and lifetime (in seconds) of negative cache entries
+NEGATIVE_DIR = os.path.join(CACHE_DIR, 'negative')
+NEGATIVE_TTL = float(os.environ.get('SPORTSREF_NEGATIVE_TTL', 6*60*60))
+
+# maximum age in seconds of an expired page that may still be served while it
+# is refreshed in the background; None disables stale-while-revalidate
+SWR_MAX_STALENESS = (float(os.environ['SPORTSREF_SWR_MAX_STALENESS'])
+                     if os.environ.get('SPORTSREF_SWR_MAX_STALENESS')
+                     else None)
+
+# whether pages are slimmed before caching, and the version of the transform;
+# bump SLIM_VERSION whenever slimHTML changes what it keeps
+SLIM_HTML = os.environ.get('SPORTSREF_SLIM_HTML', '') not in ('', '0')
+SLIM_VERSION = 1
+SLIM_MARKER_RE = re.compile(r'\s*<!-- sportsref-slim:(\d+) -->')
+
+# elements that never hold data the parsers read
+SLIM_DROP_TAGS = ['script', 'style', 'noscript', 'link', 'meta', 'iframe',
+                  'svg', 'img', 'video', 'button']
+# page chrome and ads, dropped unless they contain tables or forms
+SLIM_DROP_CHROME = [
+    '//*[@id="header"]', '//*[@id="footer"]', '//*[@id="nav"]',
+    '//*[@id="inner_nav"]', '//*[@id="site_menu"]', '//*[@id="bottom_nav"]',
+    '//*[@id="social"]', '//*[starts-with(@id, "div-gpt-ad")]',
+    '//*[contains(concat(" ", @class, " "), " adblock ")]',
+]
+
+# whether results of persistent methods are kept on disk, and where
+PERSIST_RESULTS = (os.environ.get('SPORTSREF_PERSIST_RESULTS', '')
+                   not in ('', '0'))
+RESULTS_DIR = os.path.join(CACHE_DIR, 'results')
+
+def _parquetEngine():
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return engine
+        except ImportError:
+            pass
+    return None
+
+# the engine used to store DataFrame results as Parquet; None if neither is
+# installed, in which case results are pickled
+PARQUET_ENGINE = _parquetEngine()
+
+# matches the <title> of the sites' "Page Not Found" pages
+NOT_FOUND_RE = re.compile(r'<title>[^<]*(?:Page Not Found|404 error)', re.I)
+
+_counters = collections.Counter()
+_countersLock = threading.Lock()
+
+# cache keys with a background refresh in progress
+_refreshing = set()
+_refreshLock = threading.Lock()
+
+def record(event, n=1):
+    """Increments the counter for the given cache event.
+
+    :event: One of the names in `EVENTS`.
+    :n: The amount by which to increment; defaults to 1.
+    """
+    with _countersLock:
+        _counters[event] += n
+
+def resetStats():
+    """Resets the in-process counters for the HTML cache and the memoized
+    functions.
+    """
+    with _countersLock:
+        _counters.clear()
+    for wrapper in sportsref.decorators.memoizedFunctions():
+        wrapper.counters.update(dict.fromkeys(wrapper.counters, 0))
+
+def _afterFork():
+    """Replaces this module's locks in a newly forked process, and forgets
+    the background refreshes of the parent, which don't run in the child.
+    """
+    global _countersLock, _refreshLock
+    _countersLock = threading.Lock()
+    _refreshLock = threading.Lock()
+    _refreshing.clear()
+
+def makeDirs(path):
+    """Creates a directory and its parents if needed; safe to call from
+    several threads or processes at once.
+    """
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+def atomicWrite(fn, data, modtime=None):
+    """Writes a file atomically (via a temporary file and a rename), so that
+    concurrent readers never see a partially written file and concurrent
+    writers never interleave.
+
+    :fn: The path of the file.
+    :data: The bytes to write.
+    :modtime: If given, the modification time (in seconds since the epoch) to
+    set on the file.
+    """
+    def save(tmpFN):
+        with open(tmpFN, 'wb') as f:
+            f.write(data)
+    _atomicSave(fn, save, modtime)
+
+def _atomicSave(fn, save, modtime=None):
+    # like atomicWrite, for writers that need a path rather than bytes
+    fd, tmpFN = tempfile.mkstemp(dir=os.path.dirname(fn))
+    os.close(fd)
+    try:
+        save(tmpFN)
+        os.chmod(tmpFN, 0o644)
+        if modtime is not None:
+            os.utime(tmpFN, (modtime, modtime))
+        os.rename(tmpFN, fn)
+    except BaseException:
+        if os.path.exists(tmpFN):
+            os.remove(tmpFN)
+        raise
+
+def writeEntry(fn, text, modtime=None):
+    """Writes an HTML cache file atomically; see `atomicWrite`.
+
+    :fn: The path of the cache file.
+    :text: The (encoded) contents to write.
+    :modtime: If given, the modification time (in seconds since the epoch) to
+    set on the file.
+    """
+    atomicWrite(fn, text, modtime)
+    record('bytesWritten', len(text))
+
+def setStaleWhileRevalidate(maxStaleness):
+    """Enables or disables stale-while-revalidate serving of the HTML cache.
+
+    :maxStaleness: The maximum age in seconds of an expired page that may be
+    served while it is refreshed in the background, or None to disable.
+    """
+    global SWR_MAX_STALENESS
+    SWR_MAX_STALENESS = (float(maxStaleness) if maxStaleness is not None
+                         else None)
+
+def canServeStale(age):
+    """Returns True if an expired page of the given age (in seconds) may be
+    served while it is refreshed.
+    """
+    return SWR_MAX_STALENESS is not None and age <= SWR_MAX_STALENESS
+
+def scheduleRefresh(key, refresh):
+    """Runs `refresh` on a background thread unless a refresh for the same
+    key is already in progress. Errors are counted and otherwise ignored.
+
+    :key: The cache key being refreshed.
+    :refresh: A function of no arguments that refreshes the entry.
+    :returns: The started thread, or None if a refresh was already running.
+    """
+    with _refreshLock:
+        if key in _refreshing:
+            return None
+        _refreshing.add(key)
+
+    def run():
+        try:
+            refresh()
+        except Exception:
+            record('refreshErrors')
+        finally:
+            with _refreshLock:
+                _refreshing.discard(key)
+
+    record('backgroundRefreshes')
+    thread = threading.Thread(target=run, name='sportsref-refresh-' + key)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+def setRemote(url, timeout=None):
+    """Configures the shared remote cache consulted by cacheHTML.
+
+    :url: Base URL of the key-value service (e.g., 'http://cache:8000'), or
+    None to disable the remote cache.
+    :timeout: Timeout in seconds for remote requests; defaults to the current
+    value of REMOTE_TIMEOUT.
+    """
+    global REMOTE_URL, REMOTE_TIMEOUT
+    REMOTE_URL = url.rstrip('/') if url else None
+    if timeout is not None:
+        REMOTE_TIMEOUT = float(timeout)
+
+def _remoteRequest(method, key, data=None):
+    url = '{}/{}'.format(REMOTE_URL, urllib.quote(key, safe=''))
+    req = urllib2.Request(url, data=data)
+    req.get_method = lambda: method
+    if data is not None:
+        req.add_header('Content-Type', 'text/html')
+    return urllib2.urlopen(req, timeout=REMOTE_TIMEOUT)
+
+def _lastModified(resp):
+    # None if the response has no (valid) Last-Modified header, in which case
+    # the entry's age is unknown and it can't be used
+    lm = resp.info().getheader('Last-Modified')
+    parsed = email.utils.parsedate_tz(lm) if lm else None
+    return email.utils.mktime_tz(parsed) if parsed else None
+
+def remoteGet(key):
+    """Fetches an entry from the remote cache.
+
+    :key: The cache key (the local cache filename).
+    :returns: A tuple (text, modtime) with modtime in seconds since the
+    epoch, or None if there is no remote cache, the key isn't there, or the
+    entry has no modification time.
+    """
+    if not REMOTE_URL:
+        return None
+    try:
+        resp = _remoteRequest('GET', key)
+        text = resp.read()
+        modtime = _lastModified(resp)
+    except urllib2.HTTPError as e:
+        record('remoteMisses' if e.code == 404 else 'remoteErrors')
+        return None
+    except (urllib2.URLError, httplib.HTTPException, socket.error):
+        record('remoteErrors')
+        return None
+    if modtime is None:
+        record('remoteMisses')
+        return None
+    record('remoteHits')
+    record('bytesRead', len(text))
+    return text, modtime
+
+def remoteHead(key):
+    """Checks whether the remote cache has an entry for the given key,
+    without downloading it.
+
+    :key: The cache key (the local cache filename).
+    :returns: The entry's modification time in seconds since the epoch, or
+    None if there is no remote cache, the key isn't there, or the entry has
+    no modification time.
+    """
+    if not REMOTE_URL:
+        return None
+    try:
+        resp = _remoteRequest('HEAD', key)
+    except urllib2.HTTPError as e:
+        record('remoteMisses' if e.code == 404 else 'remoteErrors')
+        return None
+    except (urllib2.URLError, httplib.HTTPException, socket.error):
+        record('remoteErrors')
+        return None
+    modtime = _lastModified(resp)
+    if modtime is None:
+        record('remoteMisses')
+    return modtime
+
+def remotePut(key, text):
+    """Uploads an entry to the remote cache. Failures are counted but
+    otherwise ignored.
+
+    :key: The cache key (the local cache filename).
+    :text: The (encoded) HTML to store.
+    :returns: True if the entry was stored, False otherwise.
+    """
+    if not REMOTE_URL:
+        return False
+    try:
+        _remoteRequest('PUT', key, data=text).read()
+    except (urllib2.URLError, httplib.HTTPException, socket.error):
+        record('remoteErrors')
+        return False
+    record('remotePuts')
+    return True
+
+def setSlimHTML(enabled):
+    """Enables or disables slimming pages before they are cached."""
+    global SLIM_HTML
+    SLIM_HTML = bool(enabled)
+
+def slimVersion(html):
+    """Returns the version of the transform that slimmed the given page, or
+    None if it is a full page.
+    """
+    m = SLIM_MARKER_RE.match(html)
+    return int(m.group(1)) if m else None
+
+def slimHTML(html):
+    """Strips a page down to the markup the parsers read.
+
+    Tables hidden in HTML comments become real elements; scripts, styles,
+    images, ads, and navigation chrome are dropped, as are inline styles and
+    event handler attributes. Tables, forms, div#meta/div#info_box and the
+    structure around them are kept, so selectors give the same results on
+    the slim page. The result starts with a marker recording SLIM_VERSION.
+
+    :html: The full HTML of a page.
+    :returns: The slimmed HTML.
+    """
+    root = lxml.html.document_fromstring(html)
+
+    # un-comment hidden tables in place
+    for comment in root.xpath('//comment()'):
+        if '<table' not in (comment.text or ''):
+            continue
+        parent = comment.getparent()
+        holder = lxml.html.fragment_fromstring(comment.text,
+                                               create_parent='div')
+        idx = parent.index(comment)
+        for i, child in enumerate(list(holder)):
+            parent.insert(idx + i, child)
+        comment.drop_tree()
+
+    for el in root.xpath('//comment()'):
+        el.drop_tree()
+    for el in root.xpath('|'.join('//' + tag for tag in SLIM_DROP_TAGS)):
+        el.drop_tree()
+    for el in root.xpath('|'.join(SLIM_DROP_CHROME)):
+        if el.getparent() is None:
+            continue
+        if el.xpath('.//table|.//form|.//*[@id="meta" or @id="info_box"]'):
+            continue
+        el.drop_tree()
+    for el in root.iter():
+        if not isinstance(el.tag, basestring):
+            continue
+        for attr in el.attrib.keys():
+            if attr == 'style' or attr.startswith('on'):
+                del el.attrib[attr]
+
+    body = lxml.html.tostring(root, encoding='unicode', method='html')
+    return u'<!-- sportsref-slim:{} -->\n{}'.format(SLIM_VERSION, body)
+
+def conformToSlim(html):
+    """Adapts a cached page to the current slimming setting.
+
+    :html: The cached page.
+    :returns: The page to use: unchanged if slimming is off or it is already
+    slim, slimmed if it is a full page, or None if it was slimmed by an older
+    version of the transform and must be downloaded again.
+    """
+    if not SLIM_HTML:
+        return html
+    version = slimVersion(html)
+    if version == SLIM_VERSION:
+        return html
+    elif version is None:
+        record('slimmed')
+        return slimHTML(html)
+    else:
+        record('slimRebuilds')
+        return None
+
+def setNegativeTTL(ttl):
+    """Sets how long negative results are cached, in seconds. A TTL of 0
+    disables negative caching.
+    """
+    global NEGATIVE_TTL
+    NEGATIVE_TTL = float(ttl)
+
+def isNotFoundPage(html):
+    """Returns True if the given HTML is one of the sites' "Page Not Found"
+    pages.
+    """
+    return bool(NOT_FOUND_RE.search(html[:4096]))
+
+def _methodCall(fun, obj, args, kwargs):
+    # identifies a method call; the object is identified by its class and its
+    # string and numeric attributes (e.g., a BoxScore's bsID), so this is
+    # stable across processes
+    scalars = (basestring, int, long, float)
+    attrs = sorted((k, v) for k, v in vars(obj).iteritems()
+                   if isinstance(v, scalars))
+    return (fun.__module__, obj.__class__.__name__, fun.__name__, attrs,
+            args, sorted(kwargs.items()))
+
+def negativeKey(fun, obj, args, kwargs):
+    """Returns the negative cache key for calling method `fun` on `obj` with
+    the given arguments. Keys are stable across processes.
+    """
+    raw = repr(_methodCall(fun, obj, args, kwargs))
+    return 'result' + hashlib.md5(raw).hexdigest()
+
+def negativeGet(key):
+    """Looks up an unexpired negative cache entry.
+
+    :key: The key of the entry; either a page's cache filename or a key from
+    `negativeKey`.
+    :returns: A tuple (found, value).
+    """
+    if NEGATIVE_TTL <= 0:
+        return False, None
+    fn = os.path.join(NEGATIVE_DIR, key)
+    try:
+        if time.time() - os.path.getmtime(fn) >= NEGATIVE_TTL:
+            return False, None
+        with open(fn, 'rb') as f:
+            value = pickle.load(f)
+    except (OSError, IOError, EOFError, pickle.UnpicklingError):
+        return False, None
+    record('negativeHits')
+    return True, value
+
+def negativePut(key, value):
+    """Stores a negative cache entry.
+
+    :key: The key of the entry; see `negativeGet`.
+    :value: The (empty) value to return on later lookups.
+    """
+    if NEGATIVE_TTL <= 0:
+        return
+    makeDirs(NEGATIVE_DIR)
+    atomicWrite(os.path.join(NEGATIVE_DIR, key),
+                pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    record('negativeStores')
+
+def setPersistResults(enabled):
+    """Turns the on-disk results of persistent methods on or off. Overrides
+    the SPORTSREF_PERSIST_RESULTS environment variable.
+    """
+    global PERSIST_RESULTS
+    PERSIST_RESULTS = bool(enabled)
+
+_codeVersions = {}
+
+def codeVersion(modules):
+    """Returns a hash of the source code of the given modules, so that
+    results computed by older code can be told apart.
+
+    :modules: The names of the modules, e.g. ['sportsref.nfl.pbp'].
+    """
+    key = tuple(modules)
+    if key not in _codeVersions:
+        h = hashlib.md5()
+        for name in key:
+            fn = sys.modules[name].__file__
+            if fn.endswith(('.pyc', '.pyo')) and os.path.isfile(fn[:-1]):
+                fn = fn[:-1]
+            with open(fn, 'rb') as f:
+                h.update(f.read())
+        _codeVersions[key] = h.hexdigest()
+    return _codeVersions[key]
+
+def resultKey(fun, obj, args, kwargs, source, modules=()):
+    """Returns the key under which the result of calling method `fun` on
+    `obj` is persisted.
+
+    Besides the call itself, the key covers the source page, the library
+    version, and the source code of the module defining `fun` and of the
+    given modules, so results are recomputed when any of them changes.
+
+    :source: The HTML of the page the result is derived from.
+    :modules: The names of the other modules whose code the result depends
+    on.
+    """
+    if isinstance(source, unicode):
+        source = source.encode('utf-8')
+    code = codeVersion([fun.__module__] + list(modules))
+    raw = repr((_methodCall(fun, obj, args, kwargs),
+                hashlib.md5(source).hexdigest(), sportsref.__version__, code))
+    return hashlib.md5(raw).hexdigest()
+
+def resultGet(key):
+    """Looks up a persisted result.
+
+    :key: The key of the result; see `resultKey`.
+    :returns: A tuple (found, value).
+    """
+    fn = os.path.join(RESULTS_DIR, key)
+    try:
+        if PARQUET_ENGINE and os.path.isfile(fn + '.parquet'):
+            value = pd.read_parquet(fn + '.parquet', engine=PARQUET_ENGINE)
+        else:
+            with open(fn + '.pkl', 'rb') as f:
+                value = pickle.load(f)
+    except (OSError, IOError, EOFError, pickle.UnpicklingError):
+        return False, None
+    record('resultHits')
+    return True, value
+
+def resultPut(key, value):
+    """Persists a result: DataFrames as Parquet when an engine is available
+    (falling back to a pickle for frames Parquet can't represent), and
+    everything else as a pickle.
+
+    :key: The key of the result; see `resultKey`.
+    :value: The result.
+    """
+    makeDirs(RESULTS_DIR)
+    fn = os.path.join(RESULTS_DIR, key)
+    if PARQUET_ENGINE and isinstance(value, pd.DataFrame):
+        try:
+            _atomicSave(fn + '.parquet', lambda tmpFN: value.to_parquet(
+                tmpFN, engine=PARQUET_ENGINE))
+            record('resultStores')
+            return
+        except Exception:
+            pass
+    atomicWrite(fn + '.pkl', pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    record('resultStores')
+
+def sportFromFilename(fn):
+    """Returns the sport abbreviation with which a cache filename starts, or
+    None if it isn't recognized.
+
+    :fn: The basename of a file in the cache directory.
+    :returns: The sport abbreviation (e.g., 'pfr', 'bkref', 'cfb') or None.
+    """
+    sports = set(sportsref.SITE_ABBREV.values()) | {'cfb', 'cbb'}
+    # check longer abbreviations first so that prefixes can't shadow them
+    for sport in sorted(sports, key=len, reverse=True):
+        if fn.startswith(sport):
+            return sport
+    return None
+
+def _ageBucket(age):
+    for label, bound in AGE_BUCKETS:
+        if bound is None or age < bound:
+            return label
+
+def inventory(cacheDir=None):
+    """Scans the cache directory and summarizes its contents by sport.
+
+    :cacheDir: The directory to scan; defaults to `CACHE_DIR`.
+    :returns: A dictionary mapping sport abbreviation to a dictionary with
+    keys 'entries', 'bytes', and 'ages' (a histogram keyed by the labels in
+    `AGE_BUCKETS`).
+    """
+    cacheDir = cacheDir or CACHE_DIR
+    ret = {}
+    if not os.path.isdir(cacheDir):
+        return ret
+    now = time.time()
+    for fn in os.listdir(cacheDir):
+        path = os.path.join(cacheDir, fn)
+        if not os.path.isfile(path):
+            continue
+        sport = sportFromFilename(fn) or 'other'
+        if sport not in ret:
+            ret[sport] = {
+                'entries': 0,
+                'bytes': 0,
+                'ages': collections.OrderedDict(
+                    (label, 0) for label, _ in AGE_BUCKETS
+                ),
+            }
+        st = os.stat(path)
+        ret[sport]['entries'] += 1
+        ret[sport]['bytes'] += st.st_size
+        ret[sport]['ages'][_ageBucket(now - st.st_mtime)] += 1
+    return ret
+
+def memoStats():
+    """Summarizes the in-process caches of all memoized functions.
+
+    :returns: A dictionary mapping function name to a dictionary with keys
+    'hits', 'misses', 'evictions', 'entries', and 'bytes' (estimated; only
+    tracked while a memoization byte limit is set).
+    """
+    ret = {}
+    for wrapper in sportsref.decorators.memoizedFunctions():
+        name = '{}.{}'.format(wrapper.__module__, wrapper.__name__)
+        info = wrapper.cache_info()
+        ret[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'evictions': wrapper.counters['evictions'],
+            'entries': info.currsize,
+            'bytes': info.currbytes,
+        }
+    return ret
+
+def stats(cacheDir=None):
+    """Returns statistics about the HTML cache and the memoization caches.
+
+    Keys of the returned dict:
+    * html - in-process counters for cacheHTML (see `EVENTS`)
+    * sports - per-sport entry counts, sizes, and age histograms on disk
+    * memo - per-function hits, misses, and entry counts for memoized
+    functions
+
+    :cacheDir: The HTML cache directory; defaults to `CACHE_DIR`.
+    :returns: A dictionary of cache statistics.
+    """
+    html = {event: _counters[event] for event in EVENTS}
+    lookups = html['hits'] + html['misses']
+    html['hitRate'] = float(html['hits']) / lookups if lookups else None
+    return {
+        'html': html,
+        'sports': inventory(cacheDir),
+        'memo': memoStats(),
+    }
+
+def _formatInventory(inv):
+    lines = []
+    labels = [label for label, _ in AGE_BUCKETS]
+    lines.append('{:<8}{:>10}{:>14}  {}'.format(
+        'sport', 'entries', 'bytes', ' '.join('{:>6}'.format(l)
+                                             for l in labels)))
+    for sport in sorted(inv):
+        d = inv[sport]
+        lines.append('{:<8}{:>10}{:>14}  {}'.format(
+            sport, d['entries'], d['bytes'],
+            ' '.join('{:>6}'.format(d['ages'][l]) for l in labels)))
+    return '\n'.join(lines)
+
+def main(argv=None):
+    """Command-line interface for inspecting the HTML cache directory."""
+    parser = argparse.ArgumentParser(
+        prog='python -m sportsref.cache',
+        description='Summarize the sportsref HTML cache.')
+    parser.add_argument('--dir', default=CACHE_DIR,
+                        help='cache directory (default: %(default)s)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the summary as JSON')
+    args = parser.parse_args(argv)
+
+    inv = inventory(args.dir)
+    if args.json:
+        print json.dumps(inv, indent=2)
+    else:
+        print 'Cache directory: {}'.format(args.dir)
+        print _formatInventory(inv)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
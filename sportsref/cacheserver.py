@@ -0,0 +1,138 @@
+"""A tiny reference server for the shared remote HTML cache.
+
+Stores each entry as a file in a directory and serves it over HTTP:
+
+* GET /<key> - returns the entry, with its Last-Modified time
+* HEAD /<key> - like GET, without the body
+* PUT /<key> - stores the request body as the entry
+
+Meant for local use and testing; run it with
+``python -m sportsref.cacheserver --port 8000 --dir /path/to/dir`` and point
+clients at it with `sportsref.cache.setRemote('http://host:8000')`.
+"""
+import argparse
+import BaseHTTPServer
+import email.utils
+import os
+import SocketServer
+import sys
+import tempfile
+import threading
+import urllib
+
+class ThreadingHTTPServer(SocketServer.ThreadingMixIn,
+                          BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+class CacheRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    """Handles GET, HEAD, and PUT requests for the entries in
+    `self.server.cacheDir`.
+    """
+
+    def _path(self):
+        key = urllib.unquote(self.path.split('?', 1)[0].lstrip('/'))
+        if not key or '/' in key or key in ('.', '..'):
+            return None
+        return os.path.join(self.server.cacheDir, key)
+
+    def _sendEntry(self, withBody):
+        path = self._path()
+        if path is None:
+            self.send_error(400, 'Bad key')
+            return
+        if not os.path.isfile(path):
+            self.send_error(404, 'Not found')
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', email.utils.formatdate(
+            os.path.getmtime(path), usegmt=True))
+        self.end_headers()
+        if withBody:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._sendEntry(withBody=True)
+
+    def do_HEAD(self):
+        self._sendEntry(withBody=False)
+
+    def do_PUT(self):
+        path = self._path()
+        if path is None:
+            self.send_error(400, 'Bad key')
+            return
+        length = int(self.headers.getheader('Content-Length') or 0)
+        body = self.rfile.read(length)
+        # write to a temporary file first so readers never see partial entries
+        fd, tmpPath = tempfile.mkstemp(dir=self.server.cacheDir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.chmod(tmpPath, 0o644)
+        os.rename(tmpPath, path)
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(
+                self, format, *args)
+
+def makeServer(cacheDir, host='127.0.0.1', port=8000, verbose=False):
+    """Creates (but doesn't start) a cache server.
+
+    :cacheDir: The directory in which entries are stored; created if needed.
+    :host: The interface on which to listen; defaults to localhost.
+    :port: The port on which to listen; 0 picks a free port.
+    :verbose: Whether to log each request to stderr.
+    :returns: A server object; call its serve_forever() method to run it.
+    """
+    if not os.path.isdir(cacheDir):
+        os.makedirs(cacheDir)
+    server = ThreadingHTTPServer((host, port), CacheRequestHandler)
+    server.cacheDir = cacheDir
+    server.verbose = verbose
+    return server
+
+def serveInBackground(cacheDir, host='127.0.0.1', port=0):
+    """Starts a cache server on a daemon thread, e.g. for tests.
+
+    :returns: A tuple (server, url); call server.shutdown() to stop it.
+    """
+    server = makeServer(cacheDir, host, port)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://{}:{}'.format(*server.server_address)
+    return server, url
+
+def main(argv=None):
+    """Command-line interface for running the cache server."""
+    parser = argparse.ArgumentParser(
+        prog='python -m sportsref.cacheserver',
+        description='Serve a shared sportsref HTML cache over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='interface to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='port to listen on (default: %(default)s)')
+    parser.add_argument('--dir', required=True,
+                        help='directory in which entries are stored')
+    parser.add_argument('--verbose', action='store_true',
+                        help='log each request')
+    args = parser.parse_args(argv)
+
+    server = makeServer(args.dir, args.host, args.port, args.verbose)
+    print 'Serving {} on http://{}:{}'.format(args.dir, *server.server_address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,36 +1,79 @@
 import collections
+import contextlib
 import copy
 import datetime
 import functools
+import inspect
 import os
 import re
+import sys
+import threading
 import time
+import types
 import urlparse
+import weakref
 
-import appdirs
 import numpy as np
 import pandas as pd
 from pyquery import PyQuery as pq
 
 import sportsref
 
-def switchToDir(dirPath):
+# whether memoized and cacheHTML functions lock around shared state so they
+# can be called from multiple threads; set before starting any threads
+THREADSAFE = os.environ.get('SPORTSREF_THREADSAFE', '') not in ('', '0')
+
+def setThreadSafe(threadsafe):
+    """Enables or disables thread-safe mode, in which memoized functions and
+    the HTML cache may be called concurrently from multiple threads (e.g.,
+    from a ThreadPoolExecutor). Overrides the SPORTSREF_THREADSAFE
+    environment variable. Call it before starting any threads.
     """
-    Decorator that switches to given directory before executing function, and
-    then returning to orignal directory.
+    global THREADSAFE
+    THREADSAFE = bool(threadsafe)
+
+class _NoLock(object):
+
+    """Stands in for a lock when thread-safe mode is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOLOCK = _NoLock()
+
+# every _KeyLocks, so that forked processes can reset them; see _afterFork
+_allKeyLocks = weakref.WeakSet()
+
+class _KeyLocks(object):
+
+    """Hands out one reentrant lock per key, so that concurrent calls for the
+    same key wait for each other while calls for other keys proceed. Locks
+    are dropped once no thread holds or waits for them.
     """
 
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            orig_cwd = os.getcwd()
-            os.chdir(dirPath)
-            ret = func(*args, **kwargs)
-            os.chdir(orig_cwd)
-            return ret
-        return wrapper
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}
+        _allKeyLocks.add(self)
 
-    return decorator
+    @contextlib.contextmanager
+    def hold(self, key):
+        with self._lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.RLock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
 
 def _cacheValid_pfr(ct, mt, fn):
     # first, if we can ensure that the file won't change,
@@ -92,14 +135,40 @@ def _cacheValid_cfb(ct, mt, fn):
     # TODO: caching for CFB
     return True
 
-def cacheHTML(func):
+def cacheHTML(func=None, onRefresh=None):
     """Caches the HTML returned by the specified function `func`. Caches it in
     the user cache determined by the appdirs package.
+
+    Can be used bare (``@cacheHTML``) or with a hook
+    (``@cacheHTML(onRefresh=f)``).
+
+    If a remote cache is configured (see `sportsref.cache.setRemote`), it is
+    consulted on a local miss, and newly downloaded pages are uploaded to it.
+
+    Missing pages and empty responses are only cached in the short-lived
+    negative cache (see `sportsref.cache.NEGATIVE_TTL`).
+
+    With stale-while-revalidate enabled (see
+    `sportsref.cache.setStaleWhileRevalidate`), an expired page that is
+    within the staleness bound is returned immediately while a fresh copy is
+    downloaded on a background thread. Only pages that were valid when they
+    were cached are served stale, so pages that are never valid (such as
+    those without a year in the URL) don't start a download on every access.
+    Once the fresh copy is cached, `onRefresh(url)` is called (if given) so
+    the caller can drop what it built from the stale copy.
+
+    With HTML slimming enabled (see `sportsref.cache.setSlimHTML`), pages are
+    slimmed before they are cached; full pages already in the cache are
+    slimmed when read, and pages slimmed by an older version of the
+    transform are downloaded again.
     """
 
-    CACHE_DIR = appdirs.user_cache_dir('sportsref', 'mgoldberg')
-    if not os.path.isdir(CACHE_DIR):
-        os.makedirs(CACHE_DIR)
+    if func is None:
+        return functools.partial(cacheHTML, onRefresh=onRefresh)
+
+    CACHE_DIR = sportsref.cache.CACHE_DIR
+    sportsref.cache.makeDirs(CACHE_DIR)
+    downloadLocks = _KeyLocks()
 
     cacheValidFuncs = lambda s: eval('_cacheValid_' + s)
 
@@ -119,76 +188,805 @@ def cacheHTML(func):
 
         if len(noPathFN) > 255:
             # filename is too long, just evaluate the function again
+            sportsref.cache.record('uncacheable')
             return func(url).decode('utf-8', 'ignore')
-        
+
+        # in thread-safe mode, only one thread loads a given page at a time
+        if THREADSAFE:
+            with downloadLocks.hold(noPathFN):
+                return load(url, sport, fn, noPathFN)
+        return load(url, sport, fn, noPathFN)
+
+    def load(url, sport, fn, noPathFN):
         # set time variables (in seconds)
+        curtime = int(time.time())
         if os.path.isfile(fn):
             modtime = int(os.path.getmtime(fn))
-            curtime = int(time.time())
 
         # if file found and caching is valid, read from file
         cacheValid = cacheValidFuncs(sport)
         if os.path.isfile(fn) and cacheValid(curtime, modtime, fn):
-            with open(fn, 'r') as f:
-                text = f.read()
+            text = readEntry(fn, modtime)
+            if text is not None:
+                sportsref.cache.record('hits')
+                return text
+
+        # if stale-while-revalidate is on and the file isn't too stale (and
+        # was valid when it was cached), serve it now and refresh it in the
+        # background
+        if (os.path.isfile(fn) and
+                sportsref.cache.canServeStale(curtime - modtime) and
+                cacheValid(modtime, modtime, fn)):
+            text = readEntry(fn, modtime)
+            if text is not None:
+                sportsref.cache.record('staleServed')
+                sportsref.cache.scheduleRefresh(
+                    noPathFN, lambda: refresh(url, fn, noPathFN))
+                return text
+
+        if os.path.isfile(fn):
+            sportsref.cache.record('staleRefetches')
+
+        # if the page was recently found to be missing, don't look again
+        found, text = sportsref.cache.negativeGet(noPathFN)
+        if found:
+            if not text:
+                raise sportsref.utils.EmptyHTMLError(
+                    'Received HTML empty response (cached)')
             return text
+
+        # next, try the shared remote cache (if one is configured), only
+        # fetching the entry if it's still valid
+        remoteMT = sportsref.cache.remoteHead(noPathFN)
+        if remoteMT is not None and not cacheValid(curtime, remoteMT, fn):
+            sportsref.cache.record('remoteMisses')
+        elif remoteMT is not None:
+            remote = sportsref.cache.remoteGet(noPathFN)
+            if remote is not None:
+                text, remoteMT = remote
+                text = sportsref.cache.conformToSlim(text)
+                if text is not None and cacheValid(curtime, remoteMT, fn):
+                    sportsref.cache.writeEntry(
+                        fn, text.encode('ascii', 'replace'), remoteMT)
+                    return text
+
         # otherwise, download html and cache it
-        else:
+        sportsref.cache.record('misses')
+        return download(url, fn, noPathFN)
+
+    def readEntry(fn, modtime):
+        # returns None if the file must be rebuilt from the site
+        with open(fn, 'r') as f:
+            raw = f.read()
+        sportsref.cache.record('bytesRead', len(raw))
+        text = sportsref.cache.conformToSlim(raw)
+        if text is not None and text is not raw:
+            # slimmed a full page; store it, keeping its modification time
+            sportsref.cache.writeEntry(
+                fn, text.encode('ascii', 'replace'), modtime)
+        return text
+
+    def download(url, fn, noPathFN):
+        try:
             text = func(url)
-            with open(fn, 'w+') as f:
-                f.write(text.encode('ascii', 'replace'))
+        except sportsref.utils.EmptyHTMLError:
+            sportsref.cache.negativePut(noPathFN, '')
+            raise
+        if sportsref.cache.isNotFoundPage(text):
+            sportsref.cache.negativePut(noPathFN, text)
             return text
-    
+        if sportsref.cache.SLIM_HTML:
+            text = sportsref.cache.slimHTML(text)
+        encoded = text.encode('ascii', 'replace')
+        sportsref.cache.writeEntry(fn, encoded)
+        sportsref.cache.remotePut(noPathFN, encoded)
+        return text
+
+    def refresh(url, fn, noPathFN):
+        with downloadLocks.hold(noPathFN) if THREADSAFE else _NOLOCK:
+            download(url, fn, noPathFN)
+        if onRefresh is not None:
+            onRefresh(url)
+
     return wrapper
 
-def memoized(fun):
-    """A simple memoize decorator."""
+def negativeCache(fun):
+    """Decorator for methods that caches empty results (e.g., from a table
+    that isn't on the page) on disk for `sportsref.cache.NEGATIVE_TTL`
+    seconds, so that repeated lookups skip fetching and parsing the page.
+    Non-empty results are returned as is.
+    """
     @functools.wraps(fun)
-    def wrapper(*args, **kwargs):
+    def wrapper(self, *args, **kwargs):
+        key = sportsref.cache.negativeKey(fun, self, args, kwargs)
+        found, ret = sportsref.cache.negativeGet(key)
+        if found:
+            return ret
+        ret = fun(self, *args, **kwargs)
+        if ret is None or (hasattr(ret, '__len__') and len(ret) == 0):
+            sportsref.cache.negativePut(key, ret)
+        return ret
 
-        # deal with lists in args
-        isList = lambda a: isinstance(a, list) or isinstance(a, np.ndarray)
-        def deListify(arg):
-            if isList(arg):
-                return tuple(map(deListify, arg))
-            else:
-                return arg
-
-        # deal with dicts in args
-        isDict = lambda d: isinstance(d, dict) or isinstance(d, pd.Series)
-        def deDictify(arg):
-            if isDict(arg):
-                items = dict(arg).items()
-                items = [(k, deListify(deDictify(v))) for k, v in items]
-                return frozenset(sorted(items))
-            else:
-                return arg
-        
-        clean_args = tuple(map(deListify, args))
-        clean_args = tuple(map(deDictify, clean_args))
-        clean_kwargs = deDictify(kwargs)
-
-        def _copy(v):
-            if isinstance(v, pq):
-                return v.clone()
-            else:
-                return copy.deepcopy(v)
+    return wrapper
 
-        key = (clean_args, clean_kwargs)
-        try:
-            ret = _copy(cache[key])
-            return ret
-        except KeyError:
-            cache[key] = fun(*args, **kwargs)
-            ret = _copy(cache[key])
+def persistent(source, dependsOn=()):
+    """Decorator for expensive methods whose results are also kept on disk,
+    so they survive the process. Only active while
+    `sportsref.cache.PERSIST_RESULTS` is on (see
+    `sportsref.cache.setPersistResults`); results are keyed by the instance,
+    the arguments, a hash of the source page, the library version, and a
+    hash of the code of the method's module and of `dependsOn`.
+
+    Persisting is only safe for results derived from the source page alone:
+    other pages a method reads aren't part of the key, so a result stays
+    the same after they change until the source page or the code does.
+
+    :source: The name of the instance attribute holding the URL of the page
+    from which the results are derived.
+    :dependsOn: The names of the other modules whose code the results depend
+    on.
+    """
+    def decorator(fun):
+        @functools.wraps(fun)
+        def wrapper(self, *args, **kwargs):
+            if not sportsref.cache.PERSIST_RESULTS:
+                return fun(self, *args, **kwargs)
+            html = sportsref.utils.getHTML(getattr(self, source))
+            key = sportsref.cache.resultKey(fun, self, args, kwargs, html,
+                                            dependsOn)
+            found, ret = sportsref.cache.resultGet(key)
+            if found:
+                return ret
+            ret = fun(self, *args, **kwargs)
+            sportsref.cache.resultPut(key, ret)
             return ret
+
+        return wrapper
+    return decorator
+
+_memoizedFunctions = []
+
+def _isList(a):
+    return isinstance(a, list) or isinstance(a, np.ndarray)
+
+def _isDict(d):
+    return isinstance(d, dict) or isinstance(d, pd.Series)
+
+def _deListify(arg):
+    if _isList(arg):
+        return tuple(map(_deListify, arg))
+    else:
+        return arg
+
+def _deDictify(arg):
+    if _isDict(arg):
+        items = dict(arg).items()
+        items = [(k, _deListify(_deDictify(v))) for k, v in items]
+        return frozenset(sorted(items))
+    else:
+        return arg
+
+def _memoKey(args, kwargs):
+    """Builds a hashable memoization key from a call's arguments, converting
+    lists/arrays to tuples and dicts/Series to frozensets.
+    """
+    clean_args = tuple(_deDictify(_deListify(a)) for a in args)
+    clean_kwargs = _deDictify(kwargs)
+    return (clean_args, clean_kwargs)
+
+# argument types that are used in memo keys as they are; old-style instances
+# are the model objects (Player, BoxScore, ...) passed as `self`
+_SCALAR_TYPES = frozenset([str, unicode, int, long, float, bool, type(None),
+                           types.InstanceType])
+
+# Key strategies, one of which is chosen for each memoized function when it's
+# decorated. Keys from the fast paths are the arguments themselves, which
+# can't collide with the (args, kwargs) pairs built by _memoKey since those
+# always contain a frozenset.
+
+def _noArgsKey(args, kwargs):
+    if args or kwargs:
+        return _memoKey(args, kwargs)
+    return ()
+
+def _singleArgKey(args, kwargs):
+    if not kwargs and len(args) == 1 and type(args[0]) in _SCALAR_TYPES:
+        return args[0]
+    return _memoKey(args, kwargs)
+
+def _scalarArgsKey(args, kwargs):
+    if not kwargs:
+        for a in args:
+            if type(a) not in _SCALAR_TYPES:
+                break
+        else:
+            return args
+    return _memoKey(args, kwargs)
+
+def _keyStrategy(fun):
+    """Chooses the key function for a memoized function from its signature.
+
+    :returns: A function of (args, kwargs) that returns a hashable key.
+    """
+    try:
+        spec = inspect.getargspec(fun)
+    except TypeError:
+        # classes and other callables
+        return _scalarArgsKey
+    if spec.varargs or spec.keywords:
+        return _scalarArgsKey
+    elif not spec.args:
+        return _noArgsKey
+    elif len(spec.args) == 1:
+        return _singleArgKey
+    else:
+        return _scalarArgsKey
+
+# default per-function limits and total byte budget for memoized caches;
+# None means unbounded
+MEMO_MAXSIZE = (int(os.environ['SPORTSREF_MEMO_MAXSIZE'])
+                if os.environ.get('SPORTSREF_MEMO_MAXSIZE') else None)
+MEMO_MAXBYTES = (int(os.environ['SPORTSREF_MEMO_MAXBYTES'])
+                 if os.environ.get('SPORTSREF_MEMO_MAXBYTES') else None)
+MEMO_TOTAL_MAXBYTES = (int(os.environ['SPORTSREF_MEMO_TOTAL_MAXBYTES'])
+                       if os.environ.get('SPORTSREF_MEMO_TOTAL_MAXBYTES')
+                       else None)
+
+# default maximum number of parsed documents kept per document function
+DOC_MAXSIZE = (int(os.environ['SPORTSREF_DOC_MAXSIZE'])
+               if os.environ.get('SPORTSREF_DOC_MAXSIZE') else None)
+
+# whether memoized functions return shared read-only results instead of copies
+MEMO_READONLY = os.environ.get('SPORTSREF_MEMO_READONLY', '') not in ('', '0')
+
+# types whose instances can be shared between callers without copying
+_IMMUTABLE_TYPES = (basestring, int, long, float, bool, type(None),
+                    datetime.date, datetime.timedelta, np.generic)
+
+# rough size of one parsed HTML element, used to size PyQuery documents
+_ELEMENT_BYTES = 400
+
+# sentinel for cache misses
+_MISSING = object()
+# sentinel for arguments of setMemoLimits that weren't given
+_KEEP = object()
+# key of the set of frozen results' keys in a cachedMethod results dict; a
+# string (that's no method's name) so it survives copying and pickling
+_FROZEN_KEYS = '__frozen__'
+
+# result types that are returned without copying
+_SCALAR_RESULTS = frozenset([str, unicode, int, long, float, bool,
+                             type(None)])
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'maxbytes',
+                  'currbytes'])
+
+_memoTotalBytes = 0
+
+# whether any default or total limit is set, in which case hits must update
+# the caches' recency order
+_memoLimited = (MEMO_MAXSIZE is not None or MEMO_MAXBYTES is not None or
+                MEMO_TOTAL_MAXBYTES is not None)
+
+# guards the structure of all memoized caches in thread-safe mode
+_memoLock = threading.RLock()
+
+# per-thread stacks of active docScopes and sessions; each scope is a list of
+# (release function, key) pairs
+_docScopeState = threading.local()
+
+def _docScopes():
+    if not hasattr(_docScopeState, 'scopes'):
+        _docScopeState.scopes = []
+    return _docScopeState.scopes
+
+def _sessions():
+    if not hasattr(_docScopeState, 'sessions'):
+        _docScopeState.sessions = []
+    return _docScopeState.sessions
+
+def _memoGuard():
+    return _memoLock if THREADSAFE else _NOLOCK
+
+def _afterFork():
+    """Replaces this module's locks in a newly forked process. Only the
+    forking thread survives a fork, so locks that other threads held at the
+    time would otherwise stay locked forever.
+    """
+    global _memoLock
+    _memoLock = threading.RLock()
+    for keyLocks in list(_allKeyLocks):
+        keyLocks._lock = threading.Lock()
+        keyLocks._locks = {}
+
+def setMemoLimits(maxsize=_KEEP, maxbytes=_KEEP, totalMaxbytes=_KEEP):
+    """Sets the default limits for memoized functions that don't specify
+    their own, and the byte budget shared by all memoized caches. These
+    override the SPORTSREF_MEMO_MAXSIZE, SPORTSREF_MEMO_MAXBYTES, and
+    SPORTSREF_MEMO_TOTAL_MAXBYTES environment variables. Limits that aren't
+    given keep their current values; pass None to remove a limit.
+
+    :maxsize: Default maximum number of entries per function.
+    :maxbytes: Default maximum estimated bytes per function.
+    :totalMaxbytes: Maximum estimated bytes across all memoized functions.
+    """
+    global MEMO_MAXSIZE, MEMO_MAXBYTES, MEMO_TOTAL_MAXBYTES, _memoLimited
+    if maxsize is not _KEEP:
+        MEMO_MAXSIZE = maxsize
+    if maxbytes is not _KEEP:
+        MEMO_MAXBYTES = maxbytes
+    if totalMaxbytes is not _KEEP:
+        MEMO_TOTAL_MAXBYTES = totalMaxbytes
+    _memoLimited = (MEMO_MAXSIZE is not None or MEMO_MAXBYTES is not None or
+                    MEMO_TOTAL_MAXBYTES is not None)
+    with _memoGuard():
+        _enforceMemoBudget()
+
+@contextlib.contextmanager
+def docScope():
+    """Context manager that releases the parsed documents loaded within it.
+
+    Documents memoized by document functions (``@memoized(doc=True)``, such
+    as `BoxScore.getIndex`) while the scope is active are dropped from their
+    caches when it exits, so a loop over thousands of pages keeps a constant
+    footprint while results derived from the documents stay memoized::
+
+        for bsID in bsIDs:
+            with sportsref.decorators.docScope():
+                frames.append(sportsref.nfl.BoxScore(bsID).pbp())
+
+    Scopes nest, and are per thread; each releases only the documents that
+    its thread loaded within it.
+    """
+    scope = []
+    _docScopes().append(scope)
+    try:
+        yield
+    finally:
+        _docScopes().remove(scope)
+        for release, key in scope:
+            release(key)
+
+@contextlib.contextmanager
+def session():
+    """Context manager that scopes model instances and memoized results.
+
+    Instances of registered model classes (see `registered`) and results of
+    memoized functions created while the session is active are kept until it
+    exits and then dropped, so the memory used by a batch of work is
+    released when the batch is done::
+
+        with sportsref.session():
+            df = sportsref.nfl.BoxScore('201509100nwe').pbp()
+
+    Results that were already memoized when the session started are left
+    alone. Sessions nest, and are per thread.
+    """
+    scope = []
+    _sessions().append(scope)
+    try:
+        yield
+    finally:
+        _sessions().remove(scope)
+        for release, key in scope:
+            release(key)
+
+def releaseDocs():
+    """Drops all parsed documents memoized by document functions."""
+    for wrapper in _memoizedFunctions:
+        if wrapper.isDoc:
+            wrapper.cache_clear()
+
+def setMemoReadOnly(readonly):
+    """Sets whether memoized functions that don't specify otherwise return
+    shared read-only results (see `memoized`) instead of copies. Overrides
+    the SPORTSREF_MEMO_READONLY environment variable.
+
+    Code that modifies the results it gets must `thaw` them first; in
+    particular, existing columns of read-only DataFrames can't be reassigned.
+    """
+    global MEMO_READONLY
+    MEMO_READONLY = bool(readonly)
+
+class FrozenDict(dict):
+
+    """A read-only dict, returned for dict results of memoized functions in
+    read-only mode. Use `thaw` to get a mutable copy.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('FrozenDict is read-only; use thaw() for a copy')
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def freeze(v):
+    """Makes a value read-only in place where possible: NumPy arrays and the
+    arrays backing DataFrames and Series are marked non-writeable, and dicts
+    become FrozenDicts. Other values are returned unchanged.
+    """
+    if isinstance(v, (pd.DataFrame, pd.Series)):
+        for blk in v._data.blocks:
+            if isinstance(blk.values, np.ndarray):
+                blk.values.flags.writeable = False
+        return v
+    elif isinstance(v, np.ndarray):
+        v.flags.writeable = False
+        return v
+    elif isinstance(v, dict) and not isinstance(v, FrozenDict):
+        return FrozenDict((k, freeze(val)) for k, val in v.iteritems())
+    else:
+        return v
+
+def thaw(v):
+    """Returns a mutable deep copy of a (possibly read-only) memoized
+    result.
+    """
+    if isinstance(v, (pd.DataFrame, pd.Series)):
+        return v.copy(deep=True)
+    elif isinstance(v, np.ndarray):
+        return v.copy()
+    elif isinstance(v, pq):
+        return v.clone()
+    else:
+        return copy.deepcopy(v)
+
+def _copyResult(v):
+    # the copy returned on each call in the default (copying) mode
+    if isinstance(v, _IMMUTABLE_TYPES):
+        return v
+    elif isinstance(v, pq):
+        return v.clone()
+    else:
+        return copy.deepcopy(v)
+
+def _shareResult(v):
+    # the value returned on each call in read-only mode; frames get a shallow
+    # copy so callers can add (but not reassign) columns without touching the
+    # cached frame
+    if isinstance(v, (pd.DataFrame, pd.Series)):
+        return v.copy(deep=False)
+    elif isinstance(v, list):
+        return list(v)
+    else:
+        return v
+
+def sizeof(v):
+    """Estimates the memory used by a memoized value, in bytes."""
+    if isinstance(v, (pd.DataFrame, pd.Series)):
+        mem = v.memory_usage(deep=True)
+        return int(mem.sum() if isinstance(mem, pd.Series) else mem)
+    elif isinstance(v, np.ndarray):
+        return v.nbytes
+    elif isinstance(v, pq):
+        return sum(sum(1 for _ in el.iter()) for el in v) * _ELEMENT_BYTES
+    elif isinstance(v, dict):
+        return sys.getsizeof(v) + sum(sizeof(k) + sizeof(val)
+                                      for k, val in v.iteritems())
+    elif isinstance(v, (list, tuple, set, frozenset)):
+        return sys.getsizeof(v) + sum(sizeof(el) for el in v)
+    else:
+        return sys.getsizeof(v)
+
+def _enforceMemoBudget():
+    # evict least recently used entries from the largest caches until the
+    # total is within budget
+    while (MEMO_TOTAL_MAXBYTES is not None and
+           _memoTotalBytes > MEMO_TOTAL_MAXBYTES):
+        largest = max(_memoizedFunctions,
+                      key=lambda w: w.cache_info().currbytes)
+        if not largest.evict():
+            break
+
+def memoized(fun=None, maxsize=None, maxbytes=None, readonly=None,
+             doc=False):
+    """A simple memoize decorator with least-recently-used eviction.
+
+    Can be used bare (``@memoized``) or with limits
+    (``@memoized(maxsize=128, maxbytes=2**28)``). Limits default to
+    MEMO_MAXSIZE and MEMO_MAXBYTES (see `setMemoLimits`); byte sizes are
+    estimates from `sizeof`, and are only tracked while some byte limit is
+    set.
+
+    By default every call returns a deep copy of the cached result (or a
+    clone, for PyQuery documents). In read-only mode (`readonly=True`, or
+    MEMO_READONLY for functions that don't specify; see `setMemoReadOnly`),
+    results are frozen once with `freeze` and then shared: arrays are
+    non-writeable, dicts are FrozenDicts, DataFrames are shallow copies over
+    read-only data, and documents and instances aren't copied at all. New
+    columns can be added to such a frame, but existing columns can't be
+    reassigned or written to (e.g. ``df['a'] = df['a'] * 2`` or
+    ``df.loc[...] = ...`` raise ValueError). Use `thaw` on a result to get a
+    mutable copy.
+
+    Functions that return parsed pages are declared with `doc=True`; their
+    maxsize defaults to DOC_MAXSIZE (SPORTSREF_DOC_MAXSIZE) and their
+    entries are released by `docScope` and `releaseDocs`.
+
+    Keys are built by a strategy chosen from the function's signature (see
+    `_keyStrategy`): calls with only scalar arguments (strings, numbers,
+    None, model instances) use the arguments themselves, so a hit costs
+    little more than a dict lookup. Recency is only tracked while some size
+    or byte limit applies, so set limits with `setMemoLimits` rather than by
+    assigning the module's globals.
+
+    The wrapper's `forget(*args, **kwargs)` drops the cached result for the
+    given arguments, if any; `cache_info()` returns a CacheInfo tuple and
+    `cache_clear()` empties the cache and resets its counters.
+    """
+    if fun is None:
+        return functools.partial(memoized, maxsize=maxsize, maxbytes=maxbytes,
+                                 readonly=readonly, doc=doc)
+
+    @functools.wraps(fun)
+    def wrapper(*args, **kwargs):
+        shared = readonly if readonly is not None else MEMO_READONLY
+        key = None
+        try:
+            # _singleArgKey, inlined for the hottest functions
+            if (makeKey is _singleArgKey and not kwargs and len(args) == 1 and
+                    type(args[0]) in _SCALAR_TYPES):
+                key = args[0]
+            else:
+                key = makeKey(args, kwargs)
+            value = cache.get(key, _MISSING)
         except TypeError:
             print 'memoization type error here', fun.__name__, key
             return fun(*args, **kwargs)
+        if (value is _MISSING or THREADSAFE or limited or _memoLimited or
+                (doc and DOC_MAXSIZE is not None) or
+                (shared and key not in frozen)):
+            value = call(key, shared, args, kwargs)
+        else:
+            counters['hits'] += 1
+        if type(value) in _SCALAR_RESULTS:
+            return value
+        return _shareResult(value) if shared else _copyResult(value)
+
+    def call(key, shared, args, kwargs):
+        # the full lookup, for misses and whenever the hit needs bookkeeping
+        if not THREADSAFE:
+            found, value = lookup(key, shared)
+            if not found:
+                value = compute(key, shared, args, kwargs)
+        else:
+            with _memoLock:
+                found, value = lookup(key, shared)
+            if not found:
+                # compute each key once, even if requested concurrently
+                with computeLocks.hold(key):
+                    with _memoLock:
+                        found, value = lookup(key, shared)
+                    if not found:
+                        value = compute(key, shared, args, kwargs)
+        return value
+
+    def lookup(key, shared):
+        # returns (found, value), marking the entry as most recently used
+        try:
+            value = cache.pop(key)
+        except KeyError:
+            return False, None
+        if shared and key not in frozen:
+            value = freeze(value)
+            frozen.add(key)
+        cache[key] = value
+        counters['hits'] += 1
+        return True, value
+
+    def compute(key, shared, args, kwargs):
+        value = fun(*args, **kwargs)
+        if shared:
+            value = freeze(value)
+        with _memoGuard():
+            counters['misses'] += 1
+            store(key, value)
+            if shared:
+                frozen.add(key)
+        return value
+
+    def limits():
+        if maxsize is not None:
+            size = maxsize
+        elif doc and DOC_MAXSIZE is not None:
+            size = DOC_MAXSIZE
+        else:
+            size = MEMO_MAXSIZE
+        return size, maxbytes if maxbytes is not None else MEMO_MAXBYTES
+
+    def store(key, value):
+        global _memoTotalBytes
+        size, nbytes = limits()
+        cache[key] = value
+        scopes = _docScopes() if doc else None
+        if scopes:
+            scopes[-1].append((discard, key))
+        sessions = _sessions()
+        if sessions:
+            sessions[-1].append((discard, key))
+        if nbytes is not None or MEMO_TOTAL_MAXBYTES is not None:
+            sizes[key] = sizeof(value)
+            state['bytes'] += sizes[key]
+            _memoTotalBytes += sizes[key]
+        while cache and (
+                (size is not None and len(cache) > size) or
+                (nbytes is not None and state['bytes'] > nbytes)):
+            evict()
+        _enforceMemoBudget()
+
+    def evict():
+        # drops the least recently used entry; returns False if empty
+        global _memoTotalBytes
+        with _memoGuard():
+            if not cache:
+                return False
+            key, _ = cache.popitem(last=False)
+            frozen.discard(key)
+            nbytes = sizes.pop(key, 0)
+            state['bytes'] -= nbytes
+            _memoTotalBytes -= nbytes
+            counters['evictions'] += 1
+            return True
+
+    def discard(key):
+        global _memoTotalBytes
+        with _memoGuard():
+            if key not in cache:
+                return
+            del cache[key]
+            frozen.discard(key)
+            nbytes = sizes.pop(key, 0)
+            state['bytes'] -= nbytes
+            _memoTotalBytes -= nbytes
+
+    def forget(*args, **kwargs):
+        try:
+            discard(makeKey(args, kwargs))
+        except TypeError:
+            pass
+
+    def cache_info():
+        size, nbytes = limits()
+        return CacheInfo(counters['hits'], counters['misses'], size,
+                         len(cache), nbytes, state['bytes'])
+
+    def cache_clear():
+        global _memoTotalBytes
+        with _memoGuard():
+            _memoTotalBytes -= state['bytes']
+            cache.clear()
+            sizes.clear()
+            frozen.clear()
+            counters.update(dict.fromkeys(counters, 0))
+            state['bytes'] = 0
+
+    makeKey = _keyStrategy(fun)
+    limited = maxsize is not None or maxbytes is not None
+    cache = collections.OrderedDict()
+    sizes = {}
+    frozen = set()
+    computeLocks = _KeyLocks()
+    state = {'bytes': 0}
+    # a plain dict, since incrementing a Counter costs more than a hit
+    counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+    wrapper.cache = cache
+    wrapper.counters = counters
+    wrapper.forget = forget
+    wrapper.isDoc = doc
+    wrapper.evict = evict
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    _memoizedFunctions.append(wrapper)
+    return wrapper
+
+def registered(cls):
+    """Class decorator that makes a model class an identity map: calling it
+    with the same arguments returns the same live instance, without copying
+    it. Instances are held weakly, so one is dropped once nothing else (such
+    as a memoized method result keyed on it, or an active `session`) refers
+    to it.
 
-    cache = {}
+    The wrapper's `registry` is the WeakValueDictionary of live instances,
+    and `forget(*args, **kwargs)` drops the instance for the given
+    arguments, if any.
+    """
+    @functools.wraps(cls)
+    def wrapper(*args, **kwargs):
+        key = None
+        try:
+            key = _scalarArgsKey(args, kwargs)
+            with _memoGuard():
+                obj = registry.get(key)
+        except TypeError:
+            print 'memoization type error here', cls.__name__, key
+            return cls(*args, **kwargs)
+        if obj is None:
+            obj = cls(*args, **kwargs)
+            with _memoGuard():
+                # another thread may have registered one in the meantime
+                obj = registry.setdefault(key, obj)
+                sessions = _sessions()
+                if sessions:
+                    sessions[-1].append((release, (key, obj)))
+        return obj
+
+    def release(entry):
+        # drops a session's instance, unless it's since been replaced
+        key, obj = entry
+        with _memoGuard():
+            if registry.get(key) is obj:
+                del registry[key]
+
+    def forget(*args, **kwargs):
+        with _memoGuard():
+            registry.pop(_scalarArgsKey(args, kwargs), None)
+
+    registry = weakref.WeakValueDictionary()
+    wrapper.registry = registry
+    wrapper.forget = forget
     return wrapper
 
+def cachedMethod(fun):
+    """Decorator for methods whose results are cached on the instance itself
+    rather than in a global dict keyed by the instance, so that a repeated
+    call costs an attribute read and a dict lookup, and results live exactly
+    as long as the object.
+
+    Results are kept in the instance's `_cachedResults` dict, which is
+    created on first use; classes with __slots__ must list '_cachedResults'
+    among them. As with `memoized`, mutable results are copied on each call
+    unless MEMO_READONLY is set, in which case they're frozen (when first
+    shared, even if they were cached before MEMO_READONLY was set) and
+    shared. Calls with unhashable arguments aren't cached.
+    """
+    name = fun.__name__
+
+    @functools.wraps(fun)
+    def wrapper(self, *args, **kwargs):
+        try:
+            results = self._cachedResults
+        except AttributeError:
+            results = self._cachedResults = {}
+        key = name
+        try:
+            if args or kwargs:
+                key = (name, _scalarArgsKey(args, kwargs))
+            value = results.get(key, _MISSING)
+        except TypeError:
+            return fun(self, *args, **kwargs)
+        if value is _MISSING:
+            value = results[key] = fun(self, *args, **kwargs)
+        if type(value) in _SCALAR_RESULTS:
+            return value
+        if not MEMO_READONLY:
+            return _copyResult(value)
+        frozen = results.setdefault(_FROZEN_KEYS, set())
+        if key not in frozen:
+            value = results[key] = freeze(value)
+            frozen.add(key)
+        return _shareResult(value)
+
+    return wrapper
+
+def memoizedFunctions():
+    """Returns a list of all functions wrapped by `memoized` so far."""
+    return list(_memoizedFunctions)
+
+def clearMemoized():
+    """Empties the caches of all memoized functions."""
+    for wrapper in _memoizedFunctions:
+        wrapper.cache_clear()
+
 def kindRPB(include_type=False):
     def decorator(fun):
         """Supports functions that return a DataFrame and have a `kind` keyword
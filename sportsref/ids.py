@@ -0,0 +1,219 @@
+"""A persistent dictionary of IDs (player IDs like 'BradTo00', team IDs,
+and so on) for storing ID columns as int32 codes.
+
+Codes are assigned in the order IDs are first seen and never change. The
+dictionary is an append-only file (ID_FILE, one ID per line, with the line
+number as the code) that is locked while it's extended, so every process
+using the same file shares one vocabulary: frames encoded by different
+processes, games, or seasons can be concatenated and joined on their codes.
+Since saved frames can only be decoded with the file they were encoded
+with, it's kept in the user data directory rather than in CACHE_DIR.
+
+Missing IDs are encoded as MISSING (-1).
+"""
+import collections
+import os
+import re
+import threading
+
+import appdirs
+import numpy as np
+import pandas as pd
+
+import sportsref
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+ID_FILE = os.path.join(appdirs.user_data_dir('sportsref', 'mgoldberg'),
+                       'ids.txt')
+MISSING = -1
+
+# backslashes, newlines, and carriage returns in IDs are escaped in ID_FILE
+_ESCAPES = {'\\': '\\\\', '\n': '\\n', '\r': '\\r'}
+_UNESCAPES = dict((v[1], k) for k, v in _ESCAPES.iteritems())
+
+_ids = []        # code -> ID
+_codes = {}      # ID -> code
+_offset = 0      # how much of ID_FILE has been read
+_table = None    # _ids as an object array, with NaN at the end for MISSING
+_lock = threading.Lock()
+
+def _afterFork():
+    # replaces the lock in a newly forked process, in case another thread
+    # held it at the time
+    global _lock
+    _lock = threading.Lock()
+
+def setIDFile(fn):
+    """Switches to the dictionary stored in the given file, e.g. to keep
+    separate vocabularies. Overrides the default, ``ids.txt`` in the user
+    data directory.
+    """
+    global ID_FILE, _ids, _codes, _offset, _table
+    with _lock:
+        ID_FILE = fn
+        _ids, _codes, _offset, _table = [], {}, 0, None
+
+def _escape(i):
+    # returns ID i as a line of ID_FILE, without the newline
+    if isinstance(i, unicode):
+        i = i.encode('utf-8')
+    return re.sub(r'[\\\n\r]', lambda m: _ESCAPES[m.group()], i)
+
+def _unescape(line):
+    # inverse of _escape
+    line = re.sub(r'\\(.)', lambda m: _UNESCAPES[m.group(1)], line)
+    return line.decode('utf-8')
+
+def _readNew(f):
+    # reads the complete lines appended to ID_FILE since it was last read
+    global _offset, _table
+    f.seek(_offset)
+    data = f.read()
+    end = data.rfind('\n') + 1
+    for line in data[:end].split('\n')[:-1]:
+        line = _unescape(line)
+        _codes[line] = len(_ids)
+        _ids.append(line)
+    _offset += end
+    if end:
+        _table = None
+
+def _lockFile(f):
+    # blocks until this process holds the lock on the open file f
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except IOError:
+                # LK_LOCK gives up after ten seconds; keep waiting
+                pass
+
+def _unlockFile(f):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _sync(new=()):
+    """Reads the IDs other processes have added to ID_FILE, then appends the
+    given IDs that aren't in it yet, all while holding a lock on the file.
+    """
+    sportsref.cache.makeDirs(os.path.dirname(ID_FILE))
+    with _lock, open(ID_FILE, 'a+') as f:
+        _lockFile(f)
+        try:
+            _readNew(f)
+            missing = [i for i in new if i not in _codes]
+            if missing:
+                f.seek(0, os.SEEK_END)
+                f.write(''.join(_escape(i) + '\n' for i in missing))
+                f.flush()
+                _readNew(f)
+        finally:
+            _unlockFile(f)
+
+def _key(i):
+    # the form in which ID i is kept in the dictionary: IDs are read back
+    # from ID_FILE as unicode, so byte strings are decoded to match
+    if isinstance(i, str):
+        return i.decode('utf-8')
+    if not isinstance(i, unicode):
+        raise TypeError('IDs must be strings, got {!r}'.format(i))
+    return i
+
+def _wrap(codes, ids):
+    # returns codes as the same kind of object as ids
+    if isinstance(ids, pd.Series):
+        return pd.Series(codes, index=ids.index, name=ids.name)
+    if np.ndim(ids) == 0:
+        return codes[0]
+    return codes
+
+def encode(ids):
+    """Encodes IDs as int32 codes, adding IDs that haven't been seen before
+    to the dictionary.
+
+    :ids: An ID string, or an array, list, or Series of them (with NaN or
+    None for missing IDs).
+    :returns: The code(s), in the same form as ids: an int, an int32 array,
+    or an int32 Series with the same index.
+    :raises TypeError: If an ID isn't a string.
+    :raises UnicodeDecodeError: If a byte string ID isn't valid UTF-8.
+    """
+    values = np.asarray(ids.values if isinstance(ids, pd.Series) else ids,
+                        dtype=object).ravel()
+    present = pd.notnull(values)
+    uniques = pd.unique(values[present])
+    keys = [_key(i) for i in uniques]
+    # a byte string and a unicode ID can have the same key
+    new = list(collections.OrderedDict.fromkeys(
+        k for k in keys if k not in _codes))
+    if new:
+        _sync(new)
+    uniqueCodes = np.array([_codes[k] for k in keys], dtype=np.int32)
+    codes = np.full(len(values), MISSING, dtype=np.int32)
+    if len(uniques):
+        positions = pd.Index(uniques).get_indexer(values[present])
+        codes[present] = uniqueCodes[positions]
+    return _wrap(codes, ids)
+
+def decode(codes):
+    """Decodes int32 codes back to IDs.
+
+    :codes: A code, or an array, list, or Series of them.
+    :returns: The ID(s), in the same form as codes: a string, an object
+    array, or a Series with the same index; MISSING decodes to NaN.
+    :raises ValueError: If a code isn't MISSING or in the dictionary.
+    """
+    global _table
+    values = np.asarray(codes.values if isinstance(codes, pd.Series)
+                        else codes, dtype=np.int64).ravel()
+    if len(values) and values.max() >= len(_ids):
+        # added by another process
+        _sync()
+    if len(values) and (values.min() < MISSING or values.max() >= len(_ids)):
+        bad = values[(values < MISSING) | (values >= len(_ids))]
+        raise ValueError('Unknown ID code(s): {}'.format(bad[:5].tolist()))
+    table = _table
+    if table is None:
+        table = _table = np.array(_ids + [np.nan], dtype=object)
+    return _wrap(table[values], codes)
+
+def encodeColumns(df, cols):
+    """Returns a copy of a DataFrame with the given ID columns encoded; see
+    `encode`. Columns that df doesn't have are skipped.
+
+    :df: The DataFrame.
+    :cols: The names of the ID columns, e.g. ['playerID'] for a gamelog.
+    :returns: A new DataFrame.
+    """
+    df = df.copy()
+    for col in cols:
+        if col in df.columns:
+            df[col] = encode(df[col].astype(object))
+    return df
+
+def decodeColumns(df, cols):
+    """Returns a copy of a DataFrame with the given encoded ID columns
+    decoded; see `decode`. Columns that df doesn't have are skipped.
+
+    :df: The DataFrame.
+    :cols: The names of the encoded ID columns.
+    :returns: A new DataFrame.
+    """
+    df = df.copy()
+    for col in cols:
+        if col in df.columns:
+            df[col] = decode(df[col])
+    return df
@@ -8,7 +8,7 @@ from pyquery import PyQuery as pq
 
 import sportsref
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class BoxScore:
 
     def __init__(self, bsID):
@@ -20,19 +20,19 @@ class BoxScore:
     def __hash__(self):
         return hash(self.bsID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getMainDoc(self):
         url = sportsref.nba.BASE_URL + 'boxscores/{}.html'.format(self.bsID)
         doc = pq(sportsref.utils.getHTML(url))
         return doc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getPBPDoc(self):
         url = sportsref.nba.BASE_URL, 'boxscores/pbp/{}.html'.format(self.bsID)
         doc = pq(sportsref.utils.getHTML(url))
         return doc
     
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def date(self):
         """Returns the date of the game. See Python datetime.date documentation
         for more.
@@ -42,7 +42,7 @@ class BoxScore:
         year, month, day = map(int, match.groups())
         return datetime.date(year=year, month=month, day=day)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def weekday(self):
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
                 'Saturday', 'Sunday']
@@ -50,7 +50,7 @@ class BoxScore:
         wd = date.weekday()
         return days[wd]
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def home(self):
         """Returns home team ID.
         :returns: 3-character string representing home team's ID.
@@ -60,7 +60,7 @@ class BoxScore:
         hm_href = table('tr td:eq(1) span a:eq(0)').attr['href']
         return sportsref.utils.relURLToID(hm_href)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def away(self):
         """Returns away team ID.
         :returns: 3-character string representing away team's ID.
@@ -70,7 +70,7 @@ class BoxScore:
         aw_href = table('tr td:eq(0) span a:eq(0)').attr['href']
         return sportsref.utils.relURLToID(aw_href)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def homeScore(self):
         """Returns score of the home team.
         :returns: int of the home score.
@@ -81,7 +81,7 @@ class BoxScore:
         hm_sc = int(re.match(r'.*?(\d+)$', hm_txt).group(1))
         return hm_sc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def awayScore(self):
         """Returns score of the away team.
         :returns: int of the away score.
@@ -92,7 +92,7 @@ class BoxScore:
         aw_sc = int(re.match(r'.*?(\d+)$', aw_txt).group(1))
         return aw_sc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def winner(self):
         """Returns the team ID of the winning team. Returns NaN if a tie."""
         hmScore = self.homeScore()
@@ -104,7 +104,7 @@ class BoxScore:
         else:
             return np.nan
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def season(self):
         """
         Returns the year ID of the season in which this game took place.
@@ -7,7 +7,7 @@ from pyquery import PyQuery as pq
 
 import sportsref
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Season(object):
 
     """Object representing a given NBA season."""
@@ -27,42 +27,53 @@ class Season(object):
     def __hash__(self):
         return hash(self._yr)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
+    def getMainIndex(self):
+        """Returns the index of the tables on the main season page.
+        :returns: sportsref.utils.DocIndex object.
+        """
+        doc = pq(sportsref.utils.getHTML(self._url(self._yr)))
+        return sportsref.utils.DocIndex(doc)
+
+    @sportsref.decorators.memoized(doc=True)
+    def getScheduleIndex(self):
+        """Returns the index of the tables on the season schedule page.
+        :returns: sportsref.utils.DocIndex object.
+        """
+        html = sportsref.utils.getHTML(self._url('{}_games'.format(self._yr)))
+        return sportsref.utils.DocIndex(pq(html))
+
     def getMainDoc(self):
         """Returns PyQuery object for the main season URL.
         :returns: PyQuery object.
         """
-        return pq(sportsref.utils.getHTML(self._url(self._yr)))
+        return self.getMainIndex().getDoc()
 
-    @sportsref.decorators.memoized
     def getScheduleDoc(self):
         """Returns PyQuery object for the season schedule URL.
         :returns: PyQuery object.
         """
-        html = sportsref.utils.getHTML(self._url('{}_games'.format(self._yr)))
-        return pq(html)
+        return self.getScheduleIndex().getDoc()
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def getTeamIDs(self):
         """Returns a list of the team IDs for the given year.
         :returns: List of team IDs.
         """
-        doc = self.getMainDoc()
-        df = sportsref.utils.parseTable(doc('table#team'))
+        df = self.getMainIndex().table('team')
         if 'team_name' in df.columns:
             return df.team_name.tolist()
         else:
             print 'ERROR: no teams found'
             return []
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def teamIDsToNames(self):
         """Mapping from 3-letter team IDs to full team names.
         :returns: Dictionary with team IDs as keys and full team strings as
         values.
         """
-        doc = self.getMainDoc()
-        table = doc('table#team')
+        table = self.getMainIndex().element('team')
         teamNames = [re.sub(r'\s\*', '', tr('td').eq(1).text())
                      for tr in table('tbody tr[class=""]').items()]
         teamIDs = self.getTeamIDs()
@@ -70,7 +81,7 @@ class Season(object):
             raise Exception("team names and team IDs don't align")
         return dict(zip(teamIDs, teamNames))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def teamNamesToIDs(self):
         """Mapping from full team names to 3-letter team IDs.
         :returns: Dictionary with tean names as keys and team IDs as values.
@@ -87,10 +98,8 @@ class Season(object):
         :kind: 'R' for regular season, 'P' for playoffs, 'B' for both.
         :returns: List of IDs for nba.BoxScore objects.
         """
-        doc = self.getScheduleDoc()
         tID = 'games' if kind == 'R' else 'games_playoffs'
-        table = doc('table#{}'.format(tID))
-        df = sportsref.utils.parseTable(table)
+        df = self.getScheduleIndex().table(tID)
         if 'box_score_text' not in df.columns:
             print 'ERROR: no boxscores found in season'
             return []
@@ -100,7 +109,7 @@ class Season(object):
         """Returns the team ID for the winner of that year's NBA Finals.
         :returns: 3-letter team ID for champ.
         """
-        doc = self.getMainDoc()
+        doc = self.getMainIndex().doc
         playoff_table = doc('div#all_playoffs > table')
         anchor = playoff_table('tr').eq(0)('td').eq(1)('a').eq(0)
         href = sportsref.utils.relURLToID(anchor.attr['href'])
@@ -110,7 +119,7 @@ class Season(object):
         """Returns the team ID for the loser of that year's NBA Finals.
         :returns: 3-letter team ID for runner-up..
         """
-        doc = self.getMainDoc()
+        doc = self.getMainIndex().doc
         playoff_table = doc('div#all_playoffs > table')
         anchor = playoff_table('tr').eq(0)('td').eq(1)('a').eq(1)
         href = sportsref.utils.relURLToID(anchor.attr['href'])
@@ -122,7 +131,7 @@ class Season(object):
         :returns: Returns a list of tuples of the form
         (home team ID, away team ID, bool(home team won)).
         """
-        doc = self.getMainDoc()
+        doc = self.getMainIndex().doc
         p_table = doc('div#all_playoffs > table')
 
         # get winners/losers
@@ -147,9 +156,7 @@ class Season(object):
         season.
         :returns: Pandas DataFrame of team stats, with team ID as index.
         """
-        doc = self.getMainDoc()
-        table = doc('table#team')
-        df = sportsref.utils.parseTable(table)
+        df = self.getMainIndex().table('team')
         return df.drop('ranker', axis=1).set_index('team_name')
 
     def oppStats(self):
@@ -158,9 +165,7 @@ class Season(object):
         :returns: Pandas DataFrame of each team's opponent's stats, with team
         ID as index.
         """
-        doc = self.getMainDoc()
-        table = doc('table#opponent')
-        df = sportsref.utils.parseTable(table)
+        df = self.getMainIndex().table('opponent')
         return df.drop('ranker', axis=1).set_index('team_name')
 
     def miscStats(self, with_arena=False):
@@ -170,9 +175,7 @@ class Season(object):
         :returns: Pandas DataFrame of each team's miscellaneous season stats,
         with team ID as index.
         """
-        doc = self.getMainDoc()
-        table = doc('table#misc')
-        df = sportsref.utils.parseTable(table)
+        df = self.getMainIndex().table('misc')
         df['attendance'] = (df['attendance']
                             .str.replace(',', '')
                             .astype(float))
@@ -14,7 +14,7 @@ __all__ = [
 
 yr = datetime.datetime.now().year
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Player:
 
     def __init__(self, playerID):
@@ -29,18 +29,18 @@ class Player:
     def __hash__(self):
         return hash(self.pID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getDoc(self):
         doc = pq(sportsref.utils.getHTML(self.mainURL))
         return doc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def name(self):
         doc = self.getDoc()
         name = doc('div#info_box h1:first').text()
         return name
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def age(self, year=yr, month=9, day=1):
         doc = self.getDoc()
         span = doc('div#info_box span#necro-birth')
@@ -52,7 +52,7 @@ class Player:
         age = delta.days / 365.
         return age
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def position(self):
         doc = self.getDoc()
         rawText = (doc('div#info_box p')
@@ -64,7 +64,7 @@ class Player:
         # multiple positions
         return allPositions[0]
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def height(self):
         doc = self.getDoc()
         try:
@@ -79,7 +79,7 @@ class Player:
         feet, inches = map(int, rawHeight.split('-'))
         return feet*12 + inches
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def weight(self):
         doc = self.getDoc()
         rawText = (doc('div#info_box p')
@@ -88,7 +88,7 @@ class Player:
         rawWeight = re.search(r'Weight: (\S+)', rawText, re.I).group(1)
         return int(rawWeight)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def hand(self):
         doc = self.getDoc()
         rawText = (doc('div#info_box p')
@@ -97,7 +97,7 @@ class Player:
         rawHand = re.search(r'Throws: (\S+)', rawText, re.I).group(1)
         return rawHand[0] # 'L' or 'R'
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftPick(self):
         doc = self.getDoc()
         rawDraft = doc('div#info_box > p:first').text()
@@ -108,7 +108,7 @@ class Player:
         else:
             return int(m.group(1))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftClass(self):
         doc = self.getDoc()
         rawDraft = doc('div#info_box > p:first').text()
@@ -118,7 +118,7 @@ class Player:
         else:
             return int(m.group(1))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftTeam(self):
         doc = self.getDoc()
         rawDraft = doc('div#info_box > p:first')
@@ -129,7 +129,7 @@ class Player:
         else:
             return m.group(1)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def college(self):
         doc = self.getDoc()
         rawText = doc('div#info_box > p:first')
@@ -137,7 +137,7 @@ class Player:
         college = re.search(r'College: (\S+)', cleanedText).group(1)
         return college
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def highSchool(self):
         doc = self.getDoc()
         rawText = doc('div#info_box > p:first')
@@ -170,6 +170,7 @@ class Player:
 
     @sportsref.decorators.memoized
     @sportsref.decorators.kindRPB(include_type=True)
+    @sportsref.decorators.negativeCache
     def gamelog(self, kind='R', year=None):
         """Gets the career gamelog of the given player.
         :kind: One of 'R', 'P', or 'B' (for regular season, playoffs, or both).
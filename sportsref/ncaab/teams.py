@@ -10,7 +10,7 @@ import sportsref
 
 yr = datetime.datetime.now().year
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Team:
 
     def __init__(self, teamID):
@@ -22,23 +22,23 @@ class Team:
     def __hash__(self):
         return hash(self.teamID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def teamYearURL(self, yr_str):
         return (sportsref.nba.BASE_URL +
                 '/teams/{}/{}.htm'.format(self.teamID, yr_str))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getMainDoc(self):
         relURL = '/teams/{}'.format(self.teamID)
         teamURL = sportsref.nba.BASE_URL + relURL
         mainDoc = pq(sportsref.utils.getHTML(teamURL))
         return mainDoc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getYearDoc(self, yr_str=yr):
         return pq(sportsref.utils.getHTML(self.teamYearURL(yr_str)))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def name(self):
         """Returns the real name of the franchise given the team ID.
 
@@ -64,6 +64,7 @@ class Team:
         raise NotImplementedError('roster')
 
     @sportsref.decorators.memoized
+    @sportsref.decorators.negativeCache
     def boxscores(self, year=yr):
         """Gets list of BoxScore objects corresponding to the box scores from
         that year.
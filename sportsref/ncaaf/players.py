@@ -14,7 +14,7 @@ __all__ = [
 
 yr = datetime.datetime.now().year
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Player:
 
     def __init__(self, playerID):
@@ -28,18 +28,18 @@ class Player:
     def __hash__(self):
         return hash(self.pID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getDoc(self):
         doc = pq(sportsref.utils.getHTML(self.mainURL))
         return doc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def name(self):
         doc = self.getDoc()
         name = doc('div#info_box h1:first').text()
         return name
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def position(self):
         doc = self.getDoc()
         rawText = (doc('div#info_box p')
@@ -51,7 +51,7 @@ class Player:
         # multiple positions
         return allPositions[0]
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def height(self):
         doc = self.getDoc()
         try:
@@ -66,7 +66,7 @@ class Player:
         feet, inches = map(int, rawHeight.split('-'))
         return feet*12 + inches
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def weight(self):
         doc = self.getDoc()
         try:
@@ -78,7 +78,7 @@ class Player:
             return np.nan
         return int(rawWeight)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftPick(self):
         doc = self.getDoc()
         rawDraft = doc('div#info_box > p:contains("Draft")').text()
@@ -89,7 +89,7 @@ class Player:
         else:
             return int(m.group(1))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftClass(self):
         doc = self.getDoc()
         rawDraft = doc('div#info_box > p:contains("Draft")').text()
@@ -100,7 +100,7 @@ class Player:
         else:
             return int(m.group(1))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftTeam(self):
         doc = self.getDoc()
         rawDraft = doc('div#info_box > p:contains("Draft")')
@@ -111,7 +111,7 @@ class Player:
         else:
             return m.group(1)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def college(self):
         """Gets the last college that the player played for."""
         doc = self.getDoc()
@@ -125,6 +125,7 @@ class Player:
 
     @sportsref.decorators.memoized
     @sportsref.decorators.kindRPB(include_type=True)
+    @sportsref.decorators.negativeCache
     def gamelog(self, kind='R', year=None):
         """Gets the career gamelog of the given player.
         :kind: One of 'R', 'P', or 'B' (for regular season, playoffs, or both).
@@ -39,7 +39,7 @@ def teamIDs():
 def listTeams():
     return teamNames().keys()
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Team:
 
     def __init__(self, teamID):
@@ -51,23 +51,23 @@ class Team:
     def __hash__(self):
         return hash(self.teamID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def teamYearURL(self, yr_str):
         return (sportsref.nfl.BASE_URL +
                 '/teams/{}/{}.htm'.format(self.teamID, yr_str))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getMainDoc(self):
         relURL = '/teams/{}'.format(self.teamID)
         teamURL = sportsref.nfl.BASE_URL + relURL
         mainDoc = pq(sportsref.utils.getHTML(teamURL))
         return mainDoc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getYearDoc(self, yr_str=yr):
         return pq(sportsref.utils.getHTML(self.teamYearURL(yr_str)))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def name(self):
         """Returns the real name of the franchise given the team ID.
 
@@ -93,6 +93,7 @@ class Team:
         raise "not yet implemented"
 
     @sportsref.decorators.memoized
+    @sportsref.decorators.negativeCache
     def boxscores(self, year=yr):
         """Gets list of BoxScore objects corresponding to the box scores from
         that year.
@@ -11,11 +11,13 @@ __all__ = [
     'BoxScore',
 ]
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class BoxScore:
 
     def __init__(self, bsID):
         self.bsID = bsID
+        self.mainURL = (sportsref.nfl.BASE_URL +
+                        '/boxscores/{}.htm'.format(bsID))
 
     def __eq__(self, other):
         return self.bsID == other.bsID
@@ -23,13 +25,18 @@ class BoxScore:
     def __hash__(self):
         return hash(self.bsID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
+    def getIndex(self):
+        """Returns the sportsref.utils.DocIndex of the boxscore page, through
+        which its tables are read.
+        """
+        doc = pq(sportsref.utils.getHTML(self.mainURL))
+        return sportsref.utils.DocIndex(doc)
+
     def getDoc(self):
-        url = sportsref.nfl.BASE_URL + '/boxscores/{}.htm'.format(self.bsID)
-        doc = pq(sportsref.utils.getHTML(url))
-        return doc
+        return self.getIndex().getDoc()
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def date(self):
         """Returns the date of the game. See Python datetime.date documentation
         for more.
@@ -39,7 +46,7 @@ class BoxScore:
         year, month, day = map(int, match.groups())
         return datetime.date(year=year, month=month, day=day)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def weekday(self):
         """Returns the day of the week on which the game occurred.
         :returns: String representation of the day of the week for the game.
@@ -51,49 +58,49 @@ class BoxScore:
         wd = date.weekday()
         return days[wd]
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def home(self):
         """Returns home team ID.
         :returns: 3-character string representing home team's ID.
         """
-        doc = self.getDoc()
+        doc = self.getIndex().doc
         table = doc('table.linescore')
         relURL = table('tr').eq(1)('a').eq(2).attr['href']
         home = sportsref.utils.relURLToID(relURL)
         return home
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def away(self):
         """Returns away team ID.
         :returns: 3-character string representing away team's ID.
         """
-        doc = self.getDoc()
+        doc = self.getIndex().doc
         table = doc('table.linescore')
         relURL = table('tr').eq(2)('a').eq(2).attr['href']
         away = sportsref.utils.relURLToID(relURL)
         return away
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def homeScore(self):
         """Returns score of the home team.
         :returns: int of the home score.
         """
-        doc = self.getDoc()
+        doc = self.getIndex().doc
         table = doc('table.linescore')
         homeScore = table('tr').eq(1)('td')[-1].text_content()
         return int(homeScore)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def awayScore(self):
         """Returns score of the away team.
         :returns: int of the away score.
         """
-        doc = self.getDoc()
+        doc = self.getIndex().doc
         table = doc('table.linescore')
         awayScore = table('tr').eq(2)('td')[-1].text_content()
         return int(awayScore)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def winner(self):
         """Returns the team ID of the winning team. Returns NaN if a tie."""
         hmScore = self.homeScore()
@@ -105,13 +112,13 @@ class BoxScore:
         else:
             return np.nan
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def week(self):
         """Returns the week in which this game took place. 18 is WC round, 19
         is Div round, 20 is CC round, 21 is SB.
         :returns: Integer from 1 to 21.
         """
-        doc = self.getDoc()
+        doc = self.getIndex().doc
         rawTxt = doc('div#page_content table').eq(0)('tr td').eq(0).text()
         match = re.search(r'Week (\d+)', rawTxt)
         if match:
@@ -119,7 +126,7 @@ class BoxScore:
         else:
             return 21 # super bowl is week 21
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def season(self):
         """
         Returns the year ID of the season in which this game took place.
@@ -127,7 +134,7 @@ class BoxScore:
 
         :returns: An int representing the year of the season.
         """
-        doc = self.getDoc()
+        doc = self.getIndex().doc
         rawTxt = doc('div#page_content table').eq(0)('tr td').eq(0).text()
         match = re.search(r'Week \d+ (\d{4})', rawTxt)
         if match:
@@ -155,9 +162,9 @@ class BoxScore:
 
         :returns: A pandas DataFrame. See the description for details.
         """
-        doc = self.getDoc()
-        a = doc('table#vis_starters')
-        h = doc('table#home_starters')
+        index = self.getIndex()
+        a = index.element('vis_starters')
+        h = index.element('home_starters')
         data = []
         for h, table in enumerate((a, h)):
             team = self.home() if h else self.away()
@@ -174,11 +181,44 @@ class BoxScore:
                 data.append(datum)
         return pd.DataFrame(data)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
+    def playerTeams(self):
+        """Returns a mapping from the ID of each player listed on the
+        boxscore page (in the starters or player stats tables) to the ID of
+        the player's team in this game.
+
+        :returns: A dictionary with player ID keys and team ID values.
+        """
+        teams = {}
+        stats = self.playerStats()
+        if {'playerID', 'team'} <= set(stats.columns):
+            teams.update(stats[['playerID', 'team']].dropna().values)
+        starters = self.starters()
+        if not starters.empty:
+            teams.update(starters[['playerID', 'team']].values)
+        return teams
+
+    def playerTeam(self, playerID):
+        """Returns the ID of the given player's team in this game, using the
+        boxscore page itself when possible and the two teams' season stat
+        tables otherwise.
+
+        :playerID: The player ID.
+        :returns: The team ID, or np.nan if the player can't be found.
+        """
+        team = self.playerTeams().get(playerID)
+        if team is not None:
+            return team
+        year = self.season()
+        for teamID in (self.home(), self.away()):
+            team = sportsref.nfl.teams.Team(teamID)
+            if playerID in team.playerIDs(year):
+                return teamID
+        return np.nan
+
+    @sportsref.decorators.cachedMethod
     def line(self):
-        doc = self.getDoc()
-        table = doc('table#game_info')
-        giTable = sportsref.utils.parseInfoTable(table)
+        giTable = self.getIndex().infoTable('game_info')
         line_text = giTable.get('vegas_line', None)
         if line_text is None:
             return np.nan
@@ -194,34 +234,30 @@ class BoxScore:
             line = 0
         return line
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def surface(self):
         """The playing surface on which the game was played.
 
         :returns: string representing the type of surface. Returns np.nan if
         not avaiable.
         """
-        doc = self.getDoc()
-        table = doc('table#game_info')
-        giTable = sportsref.utils.parseInfoTable(table)
+        giTable = self.getIndex().infoTable('game_info')
         return giTable.get('surface', np.nan)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def over_under(self):
         """
         Returns the over/under for the game as a float, or np.nan if not
         available.
         """
-        doc = self.getDoc()
-        table = doc('table#game_info')
-        giTable = sportsref.utils.parseInfoTable(table)
+        giTable = self.getIndex().infoTable('game_info')
         if 'over_under' in giTable:
             ou = giTable['over_under']
             return float(ou.split()[0])
         else:
             return np.nan
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def coinToss(self):
         """Gets information relating to the opening coin toss.
 
@@ -231,9 +267,7 @@ class BoxScore:
 
         :returns: Dictionary of coin toss-related info.
         """
-        doc = self.getDoc()
-        table = doc('table#game_info')
-        giTable = sportsref.utils.parseInfoTable(table)
+        giTable = self.getIndex().infoTable('game_info')
         if 'Won Toss' in giTable:
             # TODO: finish coinToss function
             pass
@@ -241,7 +275,7 @@ class BoxScore:
             return np.nan
         
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def weather(self):
         """Returns a dictionary of weather-related info.
 
@@ -253,9 +287,7 @@ class BoxScore:
 
         :returns: Dict of weather data.
         """
-        doc = self.getDoc()
-        table = doc('table#game_info')
-        giTable = sportsref.utils.parseInfoTable(table)
+        giTable = self.getIndex().infoTable('game_info')
         if 'weather' in giTable:
             regex = (
                 r'(?:(?P<temp>\-?\d+) degrees )?'
@@ -286,14 +318,15 @@ class BoxScore:
             }
 
     @sportsref.decorators.memoized
+    @sportsref.decorators.persistent('mainURL', dependsOn=[
+        'sportsref.utils', 'sportsref.nfl.pbp', 'sportsref.nfl.teams',
+        'sportsref.nfl.winProb'])
     def pbp(self):
         """Returns a dataframe of the play-by-play data from the game.
 
         :returns: pandas DataFrame of play-by-play. Similar to GPF.
         """
-        doc = self.getDoc()
-        table = doc('table#pbp')
-        pbp = sportsref.utils.parseTable(table)
+        pbp = self.getIndex().table('pbp')
         # make the following features conveniently available on each row
         pbp['bsID'] = self.bsID
         pbp['home'] = self.home()
@@ -310,34 +343,34 @@ class BoxScore:
         for col in ('home_wp', 'pbp_score_hm', 'pbp_score_aw'):
             if col in df.columns:
                 df[col] = df[col].shift(1)
-        df.ix[0, ['pbp_score_hm', 'pbp_score_aw']] = 0
+        df.loc[df.index[0], ['pbp_score_hm', 'pbp_score_aw']] = 0
         # fill in WP NaN's
         df.home_wp.fillna(method='ffill', inplace=True)
+        wp = df.home_wp.values.copy()
+        wpa = df.home_wpa.values.copy()
         # fix first play border after diffing/shifting for WP and WPA
-        firstPlaysOfGame = df[df.secsElapsed == 0].index
-        line = self.line()
-        for i in firstPlaysOfGame:
-            initwp = sportsref.nfl.winProb.initialWinProb(line)
-            df.ix[i, 'home_wp'] = initwp
-            df.ix[i, 'home_wpa'] = df.ix[i+1, 'home_wp'] - initwp
+        firstPlays = (df.secsElapsed == 0).values
+        if firstPlays.any():
+            initwp = sportsref.nfl.winProb.initialWinProb(self.line())
+            nextWP = np.append(wp[1:], np.nan)
+            wpa[firstPlays] = nextWP[firstPlays] - initwp
+            wp[firstPlays] = initwp
         # fix last play border after diffing/shifting for WP and WPA
-        lastPlayIdx = df.iloc[-1].name
-        lastPlayWP = df.ix[lastPlayIdx, 'home_wp']
         # if a tie, final WP is 50%; otherwise, determined by winner
         winner = self.winner()
         finalWP = 50. if pd.isnull(winner) else (winner == self.home()) * 100.
-        df.ix[lastPlayIdx, 'home_wpa'] = finalWP - lastPlayWP
+        wpa[-1] = finalWP - wp[-1]
         # fix WPA for timeouts and plays after timeouts
-        timeouts = df[df.isTimeout].index
-        for to in timeouts:
-            df.ix[to, 'home_wpa'] = 0.
-            if to + 2 in df.index:
-                wpa = df.ix[to+2, 'home_wp'] - df.ix[to+1, 'home_wp']
-            else:
-                wpa = finalWP - df.ix[to+1, 'home_wp']
-            df.ix[to+1, 'home_wpa'] = wpa
+        timeouts = df.isTimeout.values.astype(bool)
+        afterTimeouts = np.flatnonzero(timeouts) + 1
+        afterTimeouts = afterTimeouts[afterTimeouts < len(df)]
+        nextWP = np.append(wp[1:], finalWP)
+        wpa[afterTimeouts] = nextWP[afterTimeouts] - wp[afterTimeouts]
+        wpa[timeouts] = 0.
+        df['home_wp'] = wp
+        df['home_wpa'] = wpa
         # add team-related features to DataFrame
-        df = df.apply(sportsref.nfl.pbp.addTeamFeatures, axis=1)
+        df = sportsref.nfl.pbp.addTeamFeaturesFrame(df)
         # fill distToGoal NaN's
         df['distToGoal'] = np.where(df.isKickoff, 65, df.distToGoal)
         df.distToGoal.fillna(method='bfill', inplace=True)
@@ -345,16 +378,14 @@ class BoxScore:
 
         return df
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def refInfo(self):
         """Gets a dictionary of ref positions and the ref IDs of the refs for
         that game.
 
         :returns: A dictionary of ref positions and IDs.
         """
-        doc = self.getDoc()
-        table = doc('table#officials')
-        return sportsref.utils.parseInfoTable(table)
+        return self.getIndex().infoTable('officials')
 
     @sportsref.decorators.memoized
     def playerStats(self):
@@ -362,12 +393,9 @@ class BoxScore:
         individual players in the game.
         :returns: A DataFrame containing individual player stats.
         """
-        doc = self.getDoc()
+        index = self.getIndex()
         tableIDs = ('player_offense', 'player_defense', 'returns', 'kicking')
-        dfs = []
-        for tID in tableIDs:
-            table = doc('#{}'.format(tID))
-            dfs.append(sportsref.utils.parseTable(table))
+        dfs = [index.table(tID) for tID in tableIDs]
         df = pd.concat(dfs, ignore_index=True)
         df = df.reset_index(drop=True)
         df['team'] = df['team'].str.lower()
@@ -1,4 +1,9 @@
+import collections
 import copy
+import cPickle as pickle
+import itertools
+import multiprocessing
+import os
 import re
 import sys
 
@@ -17,6 +22,44 @@ PASS_OPTS = {
     'deep left': 'DL', 'deep middle': 'DM', 'deep right': 'DR',
 }
 
+# compact dtypes of play-by-play columns; see compactPBP
+PLAYER_COLS = [
+    'fairCatcher', 'fgBlockRecoverer', 'fgBlocker', 'fgKicker', 'fumbForcer',
+    'fumbRecoverer', 'fumbler', 'interceptor', 'kneelQB', 'koKicker',
+    'koReturner', 'muffRecoverer', 'muffedBy', 'onsideRecoverer', 'passer',
+    'penOn', 'puntBlockRecoverer', 'puntBlocker', 'puntReturner', 'punter',
+    'rusher', 'sacker1', 'sacker2', 'spikeQB', 'tackler1', 'tackler2',
+    'target', 'xpKicker',
+]
+TEAM_COLS = [
+    'away', 'fieldSide', 'fumbRecFieldSide', 'home', 'intFieldSide', 'opp',
+    'team', 'timeoutTeam',
+]
+PBP_SCHEMA = dict(
+    [(c, 'category') for c in PLAYER_COLS + TEAM_COLS + [
+        'bsID', 'challenger', 'location', 'passLoc', 'penalty',
+        'qtr_time_remain', 'rushDir']] +
+    [(c, 'Int8') for c in ['down', 'quarter', 'timeoutNum', 'week']] +
+    [(c, 'Int16') for c in [
+        'distToGoal', 'fgBlockRetYds', 'fgDist', 'fumbRecYdLine',
+        'fumbRetYds', 'intRetYds', 'intYdLine', 'kneelYds', 'koRetYds',
+        'koYds', 'muffRetYds', 'opp_score', 'passYds', 'pbp_score_aw',
+        'pbp_score_hm', 'penYds', 'puntBlockRetYds', 'puntRetYds', 'puntYds',
+        'rushYds', 'sackYds', 'season', 'secsElapsed', 'team_score',
+        'ydLine', 'yds_to_go']] +
+    [(c, np.float32) for c in [
+        'exp_pts_after', 'exp_pts_before', 'home_wp', 'home_wpa', 'opp_epa',
+        'opp_wp', 'opp_wpa', 'team_epa', 'team_wp', 'team_wpa']] +
+    [(c, bool) for c in [
+        'callUpheld', 'fgGood', 'isBlocked', 'isChallenge', 'isComplete',
+        'isError', 'isFairCatch', 'isFieldGoal', 'isFumble', 'isInt',
+        'isKickoff', 'isKneel', 'isLateral', 'isMuffedCatch', 'isNoPlay',
+        'isOnside', 'isPass', 'isPenalty', 'isPresnapPenalty', 'isPunt',
+        'isRun', 'isSack', 'isSafety', 'isSpike', 'isTD', 'isTimeout',
+        'isTouchback', 'isTwoPoint', 'isXP', 'oob', 'penDeclined',
+        'twoPointSuccess', 'xpGood']]
+)
+
 def expandDetails(df, detailCol='detail'):
     """Expands the details column of the given dataframe and returns the
     resulting DataFrame.
@@ -27,18 +70,14 @@ def expandDetails(df, detailCol='detail'):
     """
     df = copy.deepcopy(df)
     df['detail'] = df[detailCol]
-    dicts = map(sportsref.nfl.pbp.parsePlayDetails, df['detail'])
-    # clean up unmatched details
-    cols = {c for d in dicts if d for c in d.iterkeys()}
-    blankEntry = {c: np.nan for c in cols}
-    newDicts = [d if d else blankEntry for i, d in enumerate(dicts)]
     # get details DataFrame and merge it with original to create main DataFrame
-    details = pd.DataFrame(newDicts)
+    details = parsePlayDetailsBatch(df['detail'])
     df = pd.merge(df, details, left_index=True, right_index=True)
-    # add isError column
-    errors = [i for i, d in enumerate(dicts) if d is None]
-    df['isError'] = False
-    df.loc[errors, 'isError'] = True
+    # add isError column; isChallenge is set on every parsed play
+    if 'isChallenge' in details.columns:
+        df['isError'] = details.isChallenge.isnull()
+    else:
+        df['isError'] = True
     # fill in some NaN's necessary for cleanFeatures
     df.ix[0, 'qtr_time_remain'] = '15:00'
     df.qtr_time_remain.fillna(method='bfill', inplace=True)
@@ -46,23 +85,19 @@ def expandDetails(df, detailCol='detail'):
         pd.Series(np.where(df.quarter == 4, '0:00', '15:00')),
         inplace=True
     )
-    # use cleanFeatures to clean up and add columns
-    new_df = df.apply(cleanFeatures, axis=1)
+    # use cleanFeaturesFrame to clean up and add columns
+    new_df = cleanFeaturesFrame(df)
     return new_df
 
-@sportsref.decorators.memoized
-def parsePlayDetails(details):
-    """Parses play details from play-by-play string and returns structured
-    data.
+def _compilePlayGrammar():
+    """Builds the regexes with which parsePlayDetails parses plays.
 
-    :details: detail string for play
-    :returns: dictionary of play attributes
+    :returns: A tuple (challengeRE, plays), where plays is a list of (flag,
+    keywords, regex) tuples in the order in which the play types are tried. A
+    play type's regex can only match details that contain (in lower case) one
+    of its keywords, so it's skipped for any that don't; types without
+    keywords are always tried.
     """
-
-    # if input isn't a string, return None
-    if not isinstance(details, basestring):
-        return None
-
     rushOptRE = r'(?P<rushDir>{})'.format(
         r'|'.join(RUSH_OPTS.iterkeys())
     )
@@ -72,30 +107,11 @@ def parsePlayDetails(details):
 
     playerRE = r"\S{6,8}\d{2}"
 
-    # initialize return dictionary - struct
-    struct = {}
-
-    # handle challenges
-    # TODO: record the play both before & after an overturned challenge
     challengeRE = re.compile(
         r'.+\. (?P<challenger>.+?) challenged.*? the play was '
         '(?P<callUpheld>upheld|overturned)\.',
         re.IGNORECASE
     )
-    match = challengeRE.search(details)
-    if match:
-        struct['isChallenge'] = True
-        struct.update(match.groupdict())
-        # if overturned, only record updated play
-        if 'overturned' in details:
-            overturnedIdx = details.index('overturned.')
-            newStart = overturnedIdx + len('overturned.')
-            details = details[newStart:].strip()
-    else:
-        struct['isChallenge'] = False
-
-    # TODO: expand on laterals
-    struct['isLateral'] = details.find('lateral') != -1
 
     # create rushing regex
     rusherRE = r"(?P<rusher>{0})".format(playerRE)
@@ -260,100 +276,151 @@ def parsePlayDetails(details):
         r'.*?(?: \(no play\)))')
     psPenaltyRE = re.compile(psPenaltyREstr, re.IGNORECASE)
 
-    # try parsing as a kickoff
-    match = kickoffRE.search(details)
-    if match:
-        # parse as a kickoff
-        struct['isKickoff'] = True
-        struct.update(match.groupdict())
-        return struct
+    plays = [
+        ('isKickoff', (' kicks off', ' kicks onside'), kickoffRE),
+        ('isTimeout', ('timeout #',), timeoutRE),
+        ('isFieldGoal', (' yard field goal ',), fgRE),
+        ('isPunt', (' punts',), puntRE),
+        ('isKneel', (' kneels for ',), kneelRE),
+        ('isSpike', (' spiked the ball',), spikeRE),
+        ('isXP', ('extra point ',), extraPointRE),
+        ('isTwoPoint', ('two point attempt: ',), twoPointRE),
+        ('isPass', (' sacked ', ' pass '), passRE),
+        ('isRun', (), rushRE),
+        ('isPresnapPenalty', ('penalty on ',), psPenaltyRE),
+    ]
+    return challengeRE, plays
 
-    # try parsing as a timeout
-    match = timeoutRE.search(details)
-    if match:
-        # parse as timeout
-        struct['isTimeout'] = True
-        struct.update(match.groupdict())
-        return struct
+# compiled once at import; see _compilePlayGrammar
+_CHALLENGE_RE, _PLAY_GRAMMAR = _compilePlayGrammar()
 
-    # try parsing as a field goal
-    match = fgRE.search(details)
-    if match:
-        # parse as a field goal
-        struct['isFieldGoal'] = True
-        struct.update(match.groupdict())
-        x = struct.get('fgBlocker')
-        return struct
+def parsePlayDetails(details):
+    """Parses play details from play-by-play string and returns structured
+    data.
 
-    # try parsing as a punt
-    match = puntRE.search(details)
-    if match:
-        # parse as a punt
-        struct['isPunt'] = True
-        struct.update(match.groupdict())
-        return struct
+    :details: detail string for play
+    :returns: dictionary of play attributes
+    """
 
-    # try parsing as a kneel
-    match = kneelRE.search(details)
-    if match:
-        # parse as a kneel
-        struct['isKneel'] = True
-        struct.update(match.groupdict())
-        return struct
+    # if input isn't a string, return None
+    if not isinstance(details, basestring):
+        return None
 
-    # try parsing as a spike
-    match = spikeRE.search(details)
-    if match:
-        # parse as a spike
-        struct['isSpike'] = True
-        struct.update(match.groupdict())
-        return struct
+    # initialize return dictionary - struct
+    struct = {}
 
-    # try parsing as an XP
-    match = extraPointRE.search(details)
+    # handle challenges
+    # TODO: record the play both before & after an overturned challenge
+    lower = details.lower()
+    match = _CHALLENGE_RE.search(details) if 'challenged' in lower else None
     if match:
-        # parse as an XP
-        struct['isXP'] = True
+        struct['isChallenge'] = True
         struct.update(match.groupdict())
-        return struct
+        # if overturned, only record updated play
+        if 'overturned' in details:
+            overturnedIdx = details.index('overturned.')
+            newStart = overturnedIdx + len('overturned.')
+            details = details[newStart:].strip()
+            lower = details.lower()
+    else:
+        struct['isChallenge'] = False
 
-    # try parsing as a 2-point conversion
-    match = twoPointRE.search(details)
-    if match:
-        # parse as a 2-point conversion
-        struct['isTwoPoint'] = True
-        struct['twoPointSuccess'] = match.group('twoPointSuccess')
-        realPlay = sportsref.nfl.pbp.parsePlayDetails(match.group('twoPoint'))
-        if realPlay:
-            struct.update(realPlay)
-        return struct
+    # TODO: expand on laterals
+    struct['isLateral'] = details.find('lateral') != -1
 
-    # try parsing as a pass
-    match = passRE.search(details)
-    if match:
-        # parse as a pass
-        struct['isPass'] = True
-        struct.update(match.groupdict())
+    # try each play type in turn, skipping those whose keywords are missing
+    for flag, keywords, regex in _PLAY_GRAMMAR:
+        if keywords and not any(k in lower for k in keywords):
+            continue
+        match = regex.search(details)
+        if not match:
+            continue
+        struct[flag] = True
+        if flag == 'isTwoPoint':
+            struct['twoPointSuccess'] = match.group('twoPointSuccess')
+            realPlay = parsePlayDetails(match.group('twoPoint'))
+            if realPlay:
+                struct.update(realPlay)
+        else:
+            struct.update(match.groupdict())
         return struct
 
-    # try parsing as a run
-    match = rushRE.search(details)
-    if match:
-        # parse as a run
-        struct['isRun'] = True
-        struct.update(match.groupdict())
-        return struct
+    return None
 
-    # try parsing as a pre-snap penalty
-    match = psPenaltyRE.search(details)
-    if match:
-        # parse as a pre-snap penalty
-        struct['isPresnapPenalty'] = True
-        struct.update(match.groupdict())
-        return struct
+# the group of each play type's regex that's set whenever the regex matches
+_WITNESS_GROUPS = {
+    'isKickoff': 'koKicker', 'isTimeout': 'timeoutNum',
+    'isFieldGoal': 'fgKicker', 'isPunt': 'punter', 'isKneel': 'kneelQB',
+    'isSpike': 'spikeQB', 'isXP': 'xpGood', 'isTwoPoint': 'twoPointSuccess',
+    'isPass': 'passer', 'isRun': 'rusher', 'isPresnapPenalty': 'penOn',
+}
 
+def parsePlayDetailsBatch(details):
+    """Parses a whole column of play details at once; the batch equivalent
+    of mapping parsePlayDetails over it.
 
-    return None
+    Plays are classified with vectorized string operations on the keywords
+    of each play type (see `_compilePlayGrammar`), and each type's regex is
+    run with `str.extract` on the plays that may be of that type, in the
+    same order parsePlayDetails tries them. Challenges and two-point
+    conversions, which need more than one pass, go through parsePlayDetails.
+
+    :details: A Series of detail strings.
+    :returns: A DataFrame with the same index as `details`, with a column
+    for each feature parsePlayDetails returns and NaN where it has no value.
+    Rows for details that can't be parsed (for which parsePlayDetails returns
+    None) are all NaN.
+    """
+    details = pd.Series(details)
+    isStr = details.map(lambda d: isinstance(d, basestring)).astype(bool)
+    texts = details[isStr]
+    lower = texts.str.lower()
+
+    # plays that need the scalar parser
+    special = (lower.str.contains('challenged', regex=False) |
+               lower.str.contains('two point attempt: ', regex=False))
+    parts = []
+    specialDicts = [(i, d) for i, d in
+                    zip(texts.index[special.values],
+                        map(parsePlayDetails, texts.values[special.values]))
+                    if d]
+    if specialDicts:
+        idx, dicts = zip(*specialDicts)
+        parts.append(pd.DataFrame(list(dicts), index=list(idx)))
+
+    # everything else, one play type at a time
+    remaining = texts[~special.values]
+    remLower = lower[~special.values]
+    for flag, keywords, regex in _PLAY_GRAMMAR:
+        if remaining.empty:
+            break
+        if keywords:
+            cand = np.zeros(len(remaining), dtype=bool)
+            for k in keywords:
+                cand |= remLower.str.contains(k, regex=False).values
+        else:
+            cand = np.ones(len(remaining), dtype=bool)
+        if not cand.any():
+            continue
+        ext = remaining[cand].str.extract(regex, expand=True)
+        matched = ext[_WITNESS_GROUPS[flag]].notnull().values
+        if not matched.any():
+            continue
+        part = ext[matched].copy()
+        part[flag] = True
+        part['isChallenge'] = False
+        part['isLateral'] = remaining[cand][matched].str.contains(
+            'lateral', regex=False)
+        parts.append(part)
+        keep = np.ones(len(remaining), dtype=bool)
+        keep[np.flatnonzero(cand)[matched]] = False
+        remaining = remaining[keep]
+        remLower = remLower[keep]
+
+    if not parts:
+        return pd.DataFrame(index=details.index)
+    parsed = pd.concat(parts, sort=True)
+    return parsed.reindex(details.index)
 
 @sportsref.decorators.memoized
 def cleanFeatures(struct):
@@ -475,6 +542,175 @@ def cleanFeatures(struct):
     struct['opp_epa'] = struct['exp_pts_before'] - struct['exp_pts_after']
     return pd.Series(struct)
 
+_INT_STR_RE = re.compile(r'\s*[-+]?\d+\s*$')
+
+def _objects(arr):
+    """Returns a copy of arr as an object array."""
+    return arr.astype(object)
+
+def _equals(arr, value):
+    """Elementwise arr == value, with Python semantics for object arrays."""
+    if arr.dtype != object and isinstance(value, basestring):
+        return np.zeros(len(arr), dtype=bool)
+    return np.asarray(arr == value, dtype=bool)
+
+def _toInts(arr):
+    """Converts an array to ints the way int() would convert each value,
+    with NaN where int() would fail.
+
+    :arr: A numpy array of numbers and/or strings.
+    :returns: A float array of whole numbers (with NaN for missing values).
+    """
+    if arr.dtype != object:
+        return np.trunc(arr.astype(float))
+    nums = pd.to_numeric(arr, errors='coerce').astype(float)
+    # int() only accepts strings that are integer literals
+    notInt = np.array([isinstance(v, basestring) and not _INT_STR_RE.match(v)
+                       for v in arr], dtype=bool)
+    nums[notInt] = np.nan
+    return np.trunc(nums)
+
+def cleanFeaturesFrame(df):
+    """Column-wise equivalent of applying cleanFeatures to each row of a
+    DataFrame of plays.
+
+    :df: A DataFrame with a row for each play and a column for each feature
+    parsed from the details (as returned by parsePlayDetailsBatch, merged
+    with the play-by-play table).
+    :returns: A DataFrame equal to df.apply(cleanFeatures, axis=1).
+    """
+    n = len(df)
+    nulls = np.full(n, np.nan, dtype=object)
+    # cleaned columns, as arrays; joined with the rest of df at the end
+    out = {}
+    def col(c):
+        if c in out:
+            return out[c]
+        return df[c].values if c in df.columns else nulls
+    details = [d if isinstance(d, basestring) else ''
+               for d in col('detail')]
+
+    # First, clean up play type bools
+    ptypes = ['isKickoff', 'isTimeout', 'isFieldGoal', 'isPunt', 'isKneel',
+              'isSpike', 'isXP', 'isTwoPoint', 'isPresnapPenalty', 'isPass',
+              'isRun']
+    for pt in ptypes:
+        out[pt] = _equals(col(pt), True)
+    # Second, clean up other existing variables on a one-off basis
+    matches = [
+        ('callUpheld', 'upheld'), ('fgGood', 'good'),
+        ('isBlocked', 'blocked'), ('isComplete', 'complete'),
+        ('isFairCatch', 'fair catch'), ('isOnside', 'onside'),
+        ('isTD', ', touchdown'), ('isTouchback', ', touchback'),
+        ('penDeclined', 'Declined'), ('twoPointSuccess', 'succeeds'),
+        ('xpGood', 'good'),
+    ]
+    for var, value in matches:
+        out[var] = _equals(col(var), value)
+    out['isMuffedCatch'] = pd.notnull(col('isMuffedCatch'))
+    out['isNoPlay'] = np.array(
+        [' (no play)' in d and 'penalty enforced in end zone' not in d
+         for d in details], dtype=bool)
+    out['isSack'] = pd.notnull(col('sackYds'))
+    out['isSafety'] = _equals(col('isSafety'), ', safety') | np.array(
+        ['enforced in end zone, safety' in d for d in details], dtype=bool)
+    out['oob'] = pd.notnull(col('oob'))
+    out['passLoc'] = np.array([PASS_OPTS.get(v, np.nan)
+                               for v in col('passLoc')], dtype=object)
+    out['passYds'] = _objects(col('passYds'))
+    out['passYds'][out['isPass'] & pd.isnull(out['passYds'])] = 0
+    out['penalty'] = np.array([v.strip() if isinstance(v, basestring) else v
+                               for v in col('penalty')], dtype=object)
+    out['quarter'] = _objects(col('quarter'))
+    out['quarter'][_equals(out['quarter'], 'OT')] = 5
+    out['rushDir'] = np.array([RUSH_OPTS.get(v, np.nan)
+                               for v in col('rushDir')], dtype=object)
+    out['rushYds'] = _objects(col('rushYds'))
+    out['rushYds'][out['isRun'] & pd.isnull(out['rushYds'])] = 0
+    # map timeout team names to IDs by joining on (season, name)
+    timeoutTeam = col('timeoutTeam')
+    hasTO = pd.notnull(timeoutTeam)
+    out['timeoutTeam'] = np.full(n, np.nan, dtype=object)
+    if hasTO.any():
+        seasons = col('season')[hasTO]
+        years = list(pd.unique(seasons))
+        names = pd.concat([
+            pd.Series(sportsref.nfl.teams.teamIDs(year), dtype=object)
+            for year in years
+        ], keys=years)
+        keys = pd.MultiIndex.from_arrays([seasons, timeoutTeam[hasTO]])
+        out['timeoutTeam'][hasTO] = names.reindex(keys).values
+
+    # Third, ensure types are correct
+    bool_vars = [
+        'fgGood', 'isBlocked', 'isChallenge', 'isComplete', 'isFairCatch',
+        'isFieldGoal', 'isKickoff', 'isKneel', 'isLateral', 'isNoPlay',
+        'isPass', 'isPresnapPenalty', 'isPunt', 'isRun', 'isSack', 'isSafety',
+        'isSpike', 'isTD', 'isTimeout', 'isTouchback', 'isTwoPoint', 'isXP',
+        'isMuffedCatch', 'oob', 'penDeclined', 'twoPointSuccess', 'xpGood'
+    ]
+    int_vars = [
+        'down', 'fgBlockRetYds', 'fgDist', 'fumbRecYdLine', 'fumbRetYds',
+        'intRetYds', 'intYdLine', 'koRetYds', 'koYds', 'muffRetYds',
+        'pbp_score_aw', 'pbp_score_hm', 'passYds', 'penYds', 'puntBlockRetYds',
+        'puntRetYds', 'puntYds', 'quarter', 'rushYds', 'sackYds', 'timeoutNum',
+        'ydLine', 'yds_to_go'
+    ]
+    float_vars = [
+        'exp_pts_after', 'exp_pts_before', 'home_wp'
+    ]
+    string_vars = [
+        'challenger', 'detail', 'fairCatcher', 'fgBlockRecoverer',
+        'fgBlocker', 'fgKicker', 'fieldSide', 'fumbForcer',
+        'fumbRecFieldSide', 'fumbRecoverer', 'fumbler', 'intFieldSide',
+        'interceptor', 'kneelQB', 'koKicker', 'koReturner', 'muffRecoverer',
+        'muffedBy', 'passLoc', 'passer', 'penOn', 'penalty',
+        'puntBlockRecoverer', 'puntBlocker', 'puntReturner', 'punter',
+        'qtr_time_remain', 'rushDir', 'rusher', 'sacker1', 'sacker2',
+        'spikeQB', 'tackler1', 'tackler2', 'target', 'timeoutTeam',
+        'xpKicker'
+    ]
+    for var in bool_vars:
+        out[var] = _equals(col(var), True)
+    for var in int_vars:
+        out[var] = _toInts(col(var))
+    for var in float_vars:
+        out[var] = pd.to_numeric(col(var), errors='coerce').astype(float)
+    for var in string_vars:
+        out[var] = _objects(col(var))
+        out[var][pd.isnull(out[var])] = np.nan
+
+    # Fourth, create new helper variables based on parsed variables
+    # creating fieldSide and ydline from location
+    locs = pd.Series(col('location'), dtype=object).str.strip()
+    halves = locs.str.extract(r'^(\S+)\s+(\S+)$', expand=True)
+    hasHalf = halves[0].notnull().values
+    out['fieldSide'] = halves[0].str.lower().values
+    out['ydLine'] = _toInts(np.where(hasHalf, halves[1].values, locs.values))
+    out['fieldSide'][out['isXP']] = out['ydLine'][out['isXP']] = np.nan
+    # creating secsElapsed (in entire game) from qtr_time_remain and quarter
+    clock = pd.Series(col('qtr_time_remain'), dtype=object).str.extract(
+        r'^([^:]*):([^:]*)$', expand=True)
+    out['secsElapsed'] = (out['quarter'] * 900 -
+                          _toInts(clock[0].values) * 60 -
+                          _toInts(clock[1].values))
+    # creating columns for turnovers
+    out['isInt'] = pd.notnull(out['interceptor'])
+    out['isFumble'] = pd.notnull(out['fumbler'])
+    # create column for isPenalty
+    out['isPenalty'] = pd.notnull(out['penalty'])
+    # create columns for EPA
+    out['team_epa'] = out['exp_pts_after'] - out['exp_pts_before']
+    out['opp_epa'] = out['exp_pts_before'] - out['exp_pts_after']
+
+    # whole-number columns without missing values are ints, as with apply
+    for var in int_vars + ['ydLine', 'secsElapsed']:
+        if n and pd.notnull(out[var]).all():
+            out[var] = out[var].astype(np.int64)
+    kept = df[[c for c in df.columns if c not in out]]
+    df = pd.concat([kept, pd.DataFrame(out, index=df.index)], axis=1)
+    return df[sorted(df.columns)].infer_objects()
+
 @sportsref.decorators.memoized
 def locToFeatures(l):
     """Converts a location string "{Half}, {YardLine}" into a tuple of those
@@ -568,13 +804,9 @@ def teamAndOpp(struct, curTm=None, curOpp=None):
             curTm = pID
             curOpp = bs.away() if bs.home() == curTm else bs.home()
         elif pID:
-            player = sportsref.nfl.players.Player(pID)
-            glog = player.gamelog(kind='B')
-            if 'bsID' in glog.columns:
-                narrowed = glog.loc[glog.bsID == struct['bsID'], 'team']
-                if not narrowed.empty:
-                    curTm = narrowed.item()
-                    curOpp = bs.home() if bs.home() != curTm else bs.away()
+            curTm = bs.playerTeam(pID)
+            if pd.notnull(curTm):
+                curOpp = bs.home() if bs.home() != curTm else bs.away()
 
         return curTm, curOpp
 
@@ -617,3 +849,238 @@ def addTeamFeatures(row):
         row['team_score'] = row['pbp_score_aw']
         row['opp_score'] = row['pbp_score_hm']
     return row
+
+def addTeamFeaturesFrame(df):
+    """Column-wise equivalent of applying addTeamFeatures to each row of a
+    DataFrame of plays.
+
+    :df: A DataFrame with a row for each play after cleanFeatures has been
+    called and 'team' and 'opp' have been added.
+    :returns: A copy of df with the new features added as columns.
+    """
+    df = df.copy()
+    noTeam = df.team.isnull().values
+    # if team and opp haven't been added, leave the row as is
+    for bsID, detail in df.loc[noTeam, ['bsID', 'detail']].values:
+        print 'ERROR: team is null', bsID, detail
+    homeOnOff = (df.team == df.home).values
+    # create column for distToGoal
+    distToGoal = np.where(df.team != df.fieldSide, df.ydLine, 100 - df.ydLine)
+    distToGoal = np.where(df.isXP | df.isTwoPoint, 2, distToGoal)
+    # create column for each team's WP
+    teamWP = np.where(homeOnOff, df.home_wp, 100. - df.home_wp)
+    # create columns for each team's WPA
+    teamWPA = np.where(homeOnOff, df.home_wpa, -df.home_wpa)
+    # create column for offense and defense scores
+    feats = [
+        ('distToGoal', distToGoal),
+        ('team_wp', teamWP),
+        ('opp_wp', 100. - teamWP),
+        ('team_wpa', teamWPA),
+        ('opp_wpa', -teamWPA),
+        ('team_score', np.where(homeOnOff, df.pbp_score_hm, df.pbp_score_aw)),
+        ('opp_score', np.where(homeOnOff, df.pbp_score_aw, df.pbp_score_hm)),
+    ]
+    for col, values in feats:
+        if noTeam.any():
+            values = np.where(noTeam, np.nan, values)
+        df[col] = values
+    return df
+
+def seasonBoxScores(year):
+    """Returns the IDs of all the boxscores from a season.
+
+    :year: The year of the season in question (as an int).
+    :returns: A sorted list of boxscore IDs (which sort chronologically).
+    """
+    bsIDs = set()
+    for teamID in sportsref.nfl.teams.listTeams(year):
+        bsIDs.update(sportsref.nfl.teams.Team(teamID).boxscores(year))
+    return sorted(bsIDs)
+
+def writeGame(df, path, bsID):
+    """Writes a game's play-by-play under a directory partitioned by season
+    and week, as ``<path>/season=<season>/week=<week>/<bsID>.parquet`` (or
+    ``.pkl`` if no Parquet engine is installed or it can't write the frame;
+    see `sportsref.cache.PARQUET_ENGINE`).
+
+    :df: The game's play-by-play DataFrame.
+    :path: The root directory of the partitioned data set.
+    :bsID: The boxscore ID of the game.
+    :returns: The path of the file written.
+    """
+    dn = os.path.join(path, 'season={}'.format(df.season.iloc[0]),
+                      'week={}'.format(df.week.iloc[0]))
+    sportsref.cache.makeDirs(dn)
+    engine = sportsref.cache.PARQUET_ENGINE
+    if engine:
+        fn = os.path.join(dn, bsID + '.parquet')
+        try:
+            sportsref.cache._atomicSave(fn, lambda tmpFN: df.to_parquet(
+                tmpFN, engine=engine, index=False))
+            return fn
+        except Exception:
+            # e.g. nullable integer columns the engine can't write
+            pass
+    fn = os.path.join(dn, bsID + '.pkl')
+    sportsref.cache.atomicWrite(fn, pickle.dumps(df, pickle.HIGHEST_PROTOCOL))
+    return fn
+
+def concatGames(frames):
+    """Concatenates the play-by-play DataFrames of several games, keeping
+    flag columns boolean: a flag that's missing from some games (because it
+    was never parsed there) is False for their plays instead of turning the
+    whole column into objects. Categorical columns (see compactPBP) stay
+    categorical, with the union of the games' categories.
+
+    :frames: A list of play-by-play DataFrames.
+    :returns: A single DataFrame with a fresh index.
+    """
+    dtypes = collections.defaultdict(set)
+    for df in frames:
+        for col, dtype in df.dtypes.iteritems():
+            dtypes[col].add(dtype.name)
+    # categoricals only stay categorical if they share their categories
+    catCols = [col for col, colDtypes in dtypes.iteritems()
+               if colDtypes == {'category'} and
+               sum(col in df.columns for df in frames) == len(frames)]
+    if catCols and len(frames) > 1:
+        frames = [df.copy(deep=False) for df in frames]
+        for col in catCols:
+            cats = set()
+            for df in frames:
+                cats.update(df[col].cat.categories)
+            cats = sorted(cats)
+            for df in frames:
+                df[col] = df[col].cat.set_categories(cats)
+    df = pd.concat(frames, ignore_index=True, sort=False)
+    for col, colDtypes in dtypes.iteritems():
+        if colDtypes == {'bool'} and df[col].dtype != bool:
+            df[col] = df[col].fillna(False).astype(bool)
+    return df
+
+def _initWorker():
+    # runs in each newly forked worker of season()'s pool: locks held by the
+    # parent's other threads (background refreshes, thread-safe mode) at the
+    # time of the fork would never be released in the worker
+    sportsref.decorators._afterFork()
+    sportsref.cache._afterFork()
+    sportsref.ids._afterFork()
+
+def _gamePBP(task):
+    # builds one game's play-by-play in a worker process; see season()
+    bsID, path, compact, encodeIDs = task
+    try:
+        df = sportsref.nfl.boxscores.BoxScore(bsID).pbp()
+        sizes = (frameBytes(df),)
+        if compact:
+            df = compactPBP(df, encodeIDs)
+            sizes += (frameBytes(df),)
+        if path is not None:
+            return bsID, writeGame(df, path, bsID), None, sizes
+        return bsID, df, None, sizes
+    except Exception as e:
+        return bsID, None, '{}: {}'.format(type(e).__name__, e), None
+
+def season(year, workers=None, path=None, compact=True, encodeIDs=False):
+    """Builds the play-by-play of a whole season, parsing games in parallel
+    on a process pool.
+
+    :year: The year of the season in question (as an int).
+    :workers: The number of worker processes; defaults to the number of CPUs.
+    With 1, games are parsed serially in this process. Workers are forked
+    with fresh locks, so this is safe while background refreshes are running
+    or thread-safe mode is on.
+    :path: If given, each game is written under this directory as soon as
+    it's parsed (see `writeGame`) instead of being kept in memory.
+    :compact: Whether to convert each game to compact dtypes (see
+    `compactPBP`); the memory saved is reported when done.
+    :encodeIDs: Whether compaction stores player and team IDs as codes from
+    the shared ID dictionary (see `sportsref.ids`), which all the workers
+    extend together.
+    :returns: If path is None, a DataFrame of all the season's plays (see
+    `concatGames`), in chronological order; otherwise, a list of the paths of
+    the files written. Games that fail to parse are reported and skipped.
+    """
+    tasks = [(bsID, path, compact, encodeIDs)
+             for bsID in seasonBoxScores(year)]
+    if workers == 1:
+        pool = None
+        results = itertools.imap(_gamePBP, tasks)
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_initWorker)
+        results = pool.imap(_gamePBP, tasks)
+    try:
+        games = []
+        before = after = 0
+        for bsID, result, error, sizes in results:
+            if error:
+                print 'ERROR: failed to parse pbp for', bsID, error
+            else:
+                games.append(result)
+                before += sizes[0]
+                after += sizes[-1]
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    if compact and games:
+        print 'Compacted {} games of pbp from {:.1f}MB to {:.1f}MB ({:.0%} ' \
+            'saved)'.format(len(games), before / 1e6, after / 1e6,
+                            1. - float(after) / before)
+    if path is not None:
+        return games
+    return concatGames(games) if games else pd.DataFrame()
+
+def compactPBP(df, encodeIDs=False):
+    """Converts a play-by-play DataFrame to compact dtypes (see PBP_SCHEMA):
+    categoricals for player and team IDs and other repeated strings,
+    nullable Int8/Int16 for downs, quarters, yards, scores and times,
+    float32 for expected points and win probabilities, and bool for flags
+    (missing flags are False). Columns in the schema that df lacks are added
+    as missing values, and columns are sorted by name, so compacted frames
+    from any game or season have the same columns and dtypes.
+
+    :df: A play-by-play DataFrame, as returned by BoxScore.pbp.
+    :encodeIDs: If True, player and team ID columns (PLAYER_COLS and
+    TEAM_COLS) are stored as int32 codes from the shared ID dictionary (see
+    `sportsref.ids`) instead of as categoricals.
+    :returns: A compacted copy of df.
+    """
+    schema = PBP_SCHEMA
+    if encodeIDs:
+        schema = dict(schema)
+        schema.update((col, np.int32) for col in PLAYER_COLS + TEAM_COLS)
+    cols = {}
+    nulls = pd.Series(np.nan, index=df.index)
+    for col in df.columns:
+        dtype = schema.get(col, bool if col.startswith('hasClass_')
+                           else None)
+        values = df[col]
+        if dtype is None:
+            cols[col] = values
+        elif dtype is np.int32:
+            cols[col] = sportsref.ids.encode(values.astype(object))
+        elif dtype is bool:
+            cols[col] = values.fillna(False).astype(bool)
+        elif dtype == 'category':
+            cols[col] = values.astype('category')
+        else:
+            cols[col] = pd.to_numeric(values, errors='coerce').astype(dtype)
+    for col, dtype in schema.iteritems():
+        if col in cols:
+            continue
+        if dtype is bool:
+            cols[col] = pd.Series(False, index=df.index)
+        elif dtype is np.int32:
+            cols[col] = pd.Series(sportsref.ids.MISSING, index=df.index,
+                                  dtype=np.int32)
+        else:
+            cols[col] = nulls.astype(dtype)
+    return pd.DataFrame(cols, index=df.index, columns=sorted(cols))
+
+def frameBytes(df):
+    """Returns the memory used by a DataFrame, including the contents of
+    object columns.
+    """
+    return df.memory_usage(deep=True).sum()
@@ -11,7 +11,7 @@ __all__ = [
     'Player',
 ]
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Player:
 
     def __init__(self, playerID):
@@ -25,18 +25,18 @@ class Player:
     def __hash__(self):
         return hash(self.pID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getDoc(self):
         doc = pq(sportsref.utils.getHTML(self.mainURL))
         return doc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def name(self):
         doc = self.getDoc()
         name = doc('div#meta h1:first').text()
         return name
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def age(self, year, month=9, day=1):
         doc = self.getDoc()
         span = doc('div#meta span#necro-birth')
@@ -48,7 +48,7 @@ class Player:
         age = delta.days / 365.
         return age
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def position(self):
         doc = self.getDoc()
         rawText = (doc('div#meta p')
@@ -60,21 +60,21 @@ class Player:
         # multiple positions
         return allPositions[0]
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def height(self):
         doc = self.getDoc()
         rawText = doc('div#meta p span[itemprop="height"]').text()
         feet, inches = map(int, rawText.split('-'))
         return feet * 12 + inches
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def weight(self):
         doc = self.getDoc()
         rawText = doc('div#meta p span[itemprop="weight"]').text()
         weight = re.match(r'(\d+)lb', rawText, re.I).group(1)
         return int(weight)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def hand(self):
         doc = self.getDoc()
         try:
@@ -86,7 +86,7 @@ class Player:
             return np.nan
         return rawHand[0] # 'L' or 'R'
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftPick(self):
         doc = self.getDoc()
         rawDraft = doc('div#meta p:contains("Draft")').text()
@@ -97,7 +97,7 @@ class Player:
         else:
             return int(m.group(1))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftClass(self):
         doc = self.getDoc()
         rawDraft = doc('div#meta p:contains("Draft")').text()
@@ -107,7 +107,7 @@ class Player:
         else:
             return int(m.group(1))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def draftTeam(self):
         doc = self.getDoc()
         rawDraft = doc('div#meta p:contains("Draft")')
@@ -118,7 +118,7 @@ class Player:
         else:
             return m.group(1)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def college(self):
         doc = self.getDoc()
         rawText = doc('div#meta p:contains("College")')
@@ -126,7 +126,7 @@ class Player:
         college = re.search(r'College: (\S+)', cleanedText).group(1)
         return college
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def highSchool(self):
         doc = self.getDoc()
         rawText = doc('div#meta p:contains("High School")')
@@ -136,6 +136,7 @@ class Player:
 
     @sportsref.decorators.memoized
     @sportsref.decorators.kindRPB(include_type=True)
+    @sportsref.decorators.negativeCache
     def gamelog(self, kind='R', year=None):
         """Gets the career gamelog of the given player.
         :kind: One of 'R', 'P', or 'B' (for regular season, playoffs, or both).
@@ -62,7 +62,7 @@ def listTeams(year):
     """
     return teamNames(year).keys()
 
-@sportsref.decorators.memoized
+@sportsref.decorators.registered
 class Team:
 
     def __init__(self, teamID):
@@ -74,23 +74,23 @@ class Team:
     def __hash__(self):
         return hash(self.teamID)
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def teamYearURL(self, yr_str):
         return (sportsref.nfl.BASE_URL +
                 '/teams/{}/{}.htm'.format(self.teamID, yr_str))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getMainDoc(self):
         relURL = '/teams/{}'.format(self.teamID)
         teamURL = sportsref.nfl.BASE_URL + relURL
         mainDoc = pq(sportsref.utils.getHTML(teamURL))
         return mainDoc
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.memoized(doc=True)
     def getYearDoc(self, yr_str):
         return pq(sportsref.utils.getHTML(self.teamYearURL(yr_str)))
 
-    @sportsref.decorators.memoized
+    @sportsref.decorators.cachedMethod
     def name(self):
         """Returns the real name of the franchise given the team ID.
 
@@ -116,6 +116,20 @@ class Team:
         raise "not yet implemented"
 
     @sportsref.decorators.memoized
+    def playerIDs(self, year):
+        """Returns the IDs of the players listed anywhere in the team's stat
+        tables for the given year; a stand-in for the roster.
+
+        :year: The year of the season in question (as an int).
+        :returns: A sorted list of player IDs.
+        """
+        doc = self.getYearDoc(year)
+        links = doc('table a[href^="/players/"]')
+        return sorted({sportsref.utils.relURLToID(a.attrib['href'])
+                       for a in links})
+
+    @sportsref.decorators.memoized
+    @sportsref.decorators.negativeCache
     def boxscores(self, year):
         """Gets list of BoxScore objects corresponding to the box scores from
         that year.
@@ -1,14 +1,33 @@
+import collections
 import re
 import time
 
+import lxml.etree
 import pandas as pd
 from pyquery import PyQuery as pq
 from selenium import webdriver
 
 import sportsref
 
-@sportsref.decorators.memoized
-@sportsref.decorators.cacheHTML
+class EmptyHTMLError(Exception):
+    """Raised by getHTML when the server returns an empty page."""
+
+# equivalent to table('tbody tr').not_('.thead, .stat_total, .stat_average')
+_DATA_ROWS = lxml.etree.XPath(
+    "descendant-or-self::tbody/descendant-or-self::*/tr[not("
+    "contains(concat(' ', normalize-space(@class), ' '), ' thead ') or "
+    "contains(concat(' ', normalize-space(@class), ' '), ' stat_total ') or "
+    "contains(concat(' ', normalize-space(@class), ' '), ' stat_average '))]")
+
+def _pageRefreshed(url):
+    # called when a page served stale has been refreshed in the background:
+    # drops the stale copy memoized by getHTML and the documents parsed from
+    # it, so later lookups see the new copy
+    getHTML.forget(url)
+    sportsref.decorators.releaseDocs()
+
+@sportsref.decorators.memoized(maxsize=256)
+@sportsref.decorators.cacheHTML(onRefresh=_pageRefreshed)
 def getHTML(url):
     """Gets the HTML for the given URL using a GET request.
 
@@ -24,9 +43,9 @@ def getHTML(url):
     d.set_window_size(10000, 10000)
     d.get(url)
     html = d.page_source
-    if html == '<html><head></head><body></body></html>':
-        raise Exception("Received HTML empty response")
     d.quit()
+    if html == '<html><head></head><body></body></html>':
+        raise EmptyHTMLError("Received HTML empty response")
     timeOnRequest = time.time() - start
     timeRemaining = int(1000*(TOTAL_TIME - timeOnRequest)) # in milliseconds
     for _ in xrange(timeRemaining):
@@ -46,12 +65,11 @@ def parseTable(table):
     columns = [c.attrib['data-stat']
                for c in table('thead tr:not([class]) th[data-stat]')]
 
-    # get data
-    rows = list(table('tbody tr')
-                .not_('.thead, .stat_total, .stat_average')
-                .items())
+    # get data, walking the lxml elements directly rather than wrapping each
+    # row and cell in PyQuery objects
+    rows = [row for el in table for row in _DATA_ROWS(el)]
     data = [
-        [flattenLinks(td) for td in row.items('th,td')]
+        [_flattenElement(td) for td in row.iterdescendants('th', 'td')]
         for row in rows
     ]
 
@@ -59,18 +77,10 @@ def parseTable(table):
     df = pd.DataFrame(data, columns=columns, dtype='float')
 
     # add hasClass columns
-    allClasses = set(
-        cls
-        for row in rows
-        if row.attr['class']
-        for cls in row.attr['class'].split()
-    )
+    rowClasses = [(row.get('class') or '').split() for row in rows]
+    allClasses = set(cls for classes in rowClasses for cls in classes)
     for cls in allClasses:
-        df['hasClass_' + cls] = [
-            bool(row.attr['class'] and
-                 cls in row.attr['class'].split())
-            for row in rows
-        ]
+        df['hasClass_' + cls] = [cls in classes for classes in rowClasses]
 
     # small fixes to DataFrame
 
@@ -113,6 +123,73 @@ def parseInfoTable(table):
         ret[key] = val
     return ret
 
+class DocIndex(object):
+
+    """Index of the tables on a parsed page, built in one traversal of the
+    document and keyed by table id.
+
+    Each table is parsed (by `parseTable` or `parseInfoTable`) the first time
+    it's requested and then kept, so a page's tables are parsed at most once
+    however many methods read them; callers get copies. Memoized methods
+    that return an index share it rather than copying it, and model methods
+    that only read the page query `doc` directly instead of a clone.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._elements = collections.OrderedDict()
+        for root in doc:
+            for el in root.iter('table'):
+                tID = el.get('id')
+                if tID:
+                    self._elements.setdefault(tID, []).append(el)
+        self._tables = {}
+        self._infoTables = {}
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __sizeof__(self):
+        return (sportsref.decorators.sizeof(self.doc) +
+                sum(sportsref.decorators.sizeof(df)
+                    for df in self._tables.values()))
+
+    def getDoc(self):
+        """Returns the indexed document: shared in read-only memoization mode
+        (see `sportsref.decorators.setMemoReadOnly`), otherwise a clone.
+        """
+        if sportsref.decorators.MEMO_READONLY:
+            return self.doc
+        return self.doc.clone()
+
+    def tableIDs(self):
+        """Returns the ids of the tables on the page, in document order."""
+        return self._elements.keys()
+
+    def element(self, tableID):
+        """Returns a PyQuery object for the table(s) with the given id, which
+        is empty if there are none. The elements are shared, so they must not
+        be modified.
+        """
+        return pq(self._elements.get(tableID, []))
+
+    def table(self, tableID):
+        """Returns the table with the given id, as parsed by `parseTable`."""
+        if tableID not in self._tables:
+            self._tables[tableID] = parseTable(self.element(tableID))
+        return self._tables[tableID].copy()
+
+    def infoTable(self, tableID):
+        """Returns the info table with the given id, as parsed by
+        `parseInfoTable`.
+        """
+        if tableID not in self._infoTables:
+            self._infoTables[tableID] = parseInfoTable(self.element(tableID))
+        return dict(self._infoTables[tableID])
+
 def flattenLinks(td):
     """Flattens relative URLs within text of a table cell to IDs and returns
     the result.
@@ -138,6 +215,44 @@ def flattenLinks(td):
 
     return ''.join(_flattenC(c) for c in td.contents())
 
+# whitespace as PyQuery's text() squashes it
+_WHITESPACE_RE = re.compile(u'[\x20\x09\x0C\u200B\x0A\x0D]+')
+
+def _isBlank(text):
+    # whether PyQuery's text() would be empty for an element with this text;
+    # only zero-width spaces need the regex, as strip() keeps them
+    if not text.strip():
+        return True
+    return u'\u200b' in text and not _WHITESPACE_RE.sub(' ', text).strip()
+
+def _flattenElement(el):
+    """Like `flattenLinks`, for a single lxml element: returns None when the
+    element has no text, as PyQuery's text() would be empty; otherwise its
+    text, with links replaced by their IDs.
+
+    :el: the lxml element for the table cell
+    :returns: the string with the links flattened to IDs
+    """
+    if not len(el):
+        text = el.text
+        return None if text is None or _isBlank(text) else text
+    if _isBlank(''.join(el.itertext())):
+        return None
+
+    parts = [el.text] if el.text is not None else []
+    for c in el:
+        # skip comments and processing instructions, but not their tails
+        if isinstance(c.tag, basestring):
+            href = c.get('href')
+            if href is not None:
+                cID = relURLToID(href)
+                parts.append(cID if cID else c.text_content())
+            else:
+                parts.append(c.text_content())
+        if c.tail is not None:
+            parts.append(c.tail)
+    return ''.join(parts)
+
 @sportsref.decorators.memoized
 def relURLToID(url):
     """Converts a relative URL to a unique ID.